@@ -5,6 +5,7 @@
 from typing import Dict, List
 import yaml
 from pathlib import Path
+import numpy as np
 
 class CriteriaConfig:
     """Enhanced configuration for land evaluation criteria"""
@@ -224,13 +225,16 @@ class CriteriaConfig:
     @classmethod
     def _adjust_criteria_weights(cls, base_criteria: Dict, features: Dict) -> Dict:
         """Dynamically adjust criteria weights based on features"""
-        adjusted = base_criteria.copy()
+        # One level deeper than dict.copy(): the category dicts are scaled
+        # in place below and must not alias the class-level presets
+        adjusted = {cat: dict(weights) for cat, weights in base_criteria.items()}
         
         # Increase accessibility weight if remote
         if features.get('nearest_road_distance', 0) > 2000:
-            if 'accessibility' in adjusted:
-                for key in adjusted['accessibility']:
-                    adjusted['accessibility'][key] *= 1.3
+            accessibility = adjusted.get('accessibility')
+            if accessibility:
+                for key in accessibility:
+                    accessibility[key] *= 1.3
         
         # Increase infrastructure weight if utilities lacking
         utilities_count = sum([
@@ -239,9 +243,10 @@ class CriteriaConfig:
             features.get('sewage_system', False)
         ])
         if utilities_count < 3:
-            if 'infrastructure' in adjusted:
-                for key in adjusted['infrastructure']:
-                    adjusted['infrastructure'][key] *= 1.2
+            infrastructure = adjusted.get('infrastructure')
+            if infrastructure:
+                for key in infrastructure:
+                    infrastructure[key] *= 1.2
         
         # Normalize weights to sum to 1.0
         return cls._normalize_weights(adjusted)
@@ -249,22 +254,24 @@ class CriteriaConfig:
     @classmethod
     def _normalize_weights(cls, criteria: Dict) -> Dict:
         """Normalize all weights to sum to 1.0"""
-        total = sum(
-            sum(weights.values()) 
-            for weights in criteria.values()
+        # Imported here so loading the config layer never pulls in core
+        from core._numba_kernels import normalize
+        
+        # Flatten in dict order, normalize in one kernel call, zip back
+        values = np.fromiter(
+            (value for weights in criteria.values() for value in weights.values()),
+            dtype=np.float64
         )
         
-        if total == 0:
+        if values.sum() == 0:
             return criteria
         
-        normalized = {}
-        for category, weights in criteria.items():
-            normalized[category] = {
-                key: value / total 
-                for key, value in weights.items()
-            }
+        normalized = iter(normalize(values).tolist())
         
-        return normalized
+        return {
+            category: {key: next(normalized) for key in weights}
+            for category, weights in criteria.items()
+        }
     
     @classmethod
     def flatten_criteria(cls, criteria: Dict) -> Dict:
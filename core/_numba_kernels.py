@@ -0,0 +1,202 @@
+# ============================================================================
+# FILE: core/_numba_kernels.py
+# Numba-compiled numeric kernels for batch pipelines
+# ============================================================================
+
+"""
+Small numeric kernels shared by the feature extractors and criteria config
+
+When numba is installed the kernels are JIT-compiled (and cached on disk);
+otherwise the same bodies (or, for loop kernels, a NumPy equivalent) run as
+plain vectorized NumPy, so callers never need to check HAS_NUMBA themselves.
+"""
+
+import math
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+    def njit(*args, **kwargs):
+        """No-op stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True)
+def normalize(weights: np.ndarray) -> np.ndarray:
+    """Scale weights so they sum to 1.0 (caller guarantees a non-zero sum)"""
+    return weights * (1.0 / weights.sum())
+
+
+@njit(cache=True)
+def shannon(proportions: np.ndarray) -> float:
+    """Shannon index H = -Σ(pi * ln(pi)) over the non-zero proportions"""
+    p = proportions[proportions > 0]
+    return -(p * np.log(p)).sum()
+
+
+if HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def line_distances(
+        point: np.ndarray,
+        seg_a: np.ndarray,
+        seg_b: np.ndarray,
+        seg_counts: np.ndarray
+    ) -> np.ndarray:
+        """
+        Minimum point-to-segment distance per polyline
+        
+        Segments of each polyline are contiguous in seg_a/seg_b; seg_counts
+        gives how many belong to each. One fused pass, no temporaries.
+        """
+        n_lines = seg_counts.shape[0]
+        starts = np.zeros(n_lines, dtype=np.int64)
+        for i in range(1, n_lines):
+            starts[i] = starts[i - 1] + seg_counts[i - 1]
+        
+        px = point[0]
+        py = point[1]
+        out = np.empty(n_lines)
+        for line in prange(n_lines):
+            best = np.inf
+            for s in range(starts[line], starts[line] + seg_counts[line]):
+                ax = seg_a[s, 0]
+                ay = seg_a[s, 1]
+                dx = seg_b[s, 0] - ax
+                dy = seg_b[s, 1] - ay
+                length_sq = dx * dx + dy * dy
+                t = 0.0
+                if length_sq > 0.0:
+                    t = min(max(((px - ax) * dx + (py - ay) * dy) / length_sq, 0.0), 1.0)
+                ex = px - (ax + t * dx)
+                ey = py - (ay + t * dy)
+                dist = math.sqrt(ex * ex + ey * ey)
+                if dist < best:
+                    best = dist
+            out[line] = best
+        return out
+else:
+    def line_distances(
+        point: np.ndarray,
+        seg_a: np.ndarray,
+        seg_b: np.ndarray,
+        seg_counts: np.ndarray
+    ) -> np.ndarray:
+        """
+        Minimum point-to-segment distance per polyline
+        
+        Segments of each polyline are contiguous in seg_a/seg_b; seg_counts
+        gives how many belong to each.
+        """
+        ab = seg_b - seg_a
+        ap = point - seg_a
+        length_sq = np.einsum('ij,ij->i', ab, ab)
+        # Degenerate (zero-length) segments project onto their start point
+        t = np.divide(
+            np.einsum('ij,ij->i', ap, ab), length_sq,
+            out=np.zeros_like(length_sq), where=length_sq > 0
+        )
+        np.clip(t, 0.0, 1.0, out=t)
+        seg_dist = np.linalg.norm(ap - t[:, None] * ab, axis=1)
+        starts = np.concatenate(([0], np.cumsum(seg_counts)[:-1]))
+        return np.minimum.reduceat(seg_dist, starts)
+
+
+# Terrain scoring bands. Buildability: penalty per band of mean slope (deg,
+# bands closed below), +1 per max slope (deg) edge exceeded, +1 per
+# elevation range (m) edge exceeded; class = score edges reached.
+# Complexity: the first band where both mean slope and range are below
+# their edges (flat, gentle, rolling, hilly), else mountainous.
+_SLOPE_EDGES = np.array([3.0, 8.0, 15.0, 25.0])
+_SLOPE_PENALTIES = np.array([0, 1, 2, 4, 6])
+_MAX_SLOPE_EDGES = np.array([25.0, 35.0])
+_RANGE_EDGES = np.array([100.0, 200.0])
+_SCORE_EDGES = np.array([2.0, 4.0, 6.0, 8.0])
+_COMPLEXITY_SLOPE_EDGES = np.array([2.0, 5.0, 10.0, 20.0])
+_COMPLEXITY_RANGE_EDGES = np.array([20.0, 50.0, 100.0, 300.0])
+
+
+if HAS_NUMBA:
+    @njit(parallel=True, cache=True)
+    def terrain_scores(
+        avg_slope: np.ndarray,
+        max_slope: np.ndarray,
+        elevation_range: np.ndarray
+    ):
+        """
+        Buildability score/class and terrain complexity class per site
+        
+        Returns (score, buildability class index, slope penalty, elevation
+        penalty, complexity class index); one fused pass over the sites.
+        """
+        n = avg_slope.shape[0]
+        score = np.empty(n)
+        buildability_class = np.empty(n, dtype=np.uint8)
+        slope_penalty = np.empty(n, dtype=np.int64)
+        elevation_penalty = np.empty(n, dtype=np.int64)
+        complexity_class = np.empty(n, dtype=np.uint8)
+        for i in prange(n):
+            slope = avg_slope[i]
+            relief = elevation_range[i]
+            
+            band = 0
+            while band < _SLOPE_EDGES.shape[0] and slope >= _SLOPE_EDGES[band]:
+                band += 1
+            s_pen = _SLOPE_PENALTIES[band]
+            for edge in _MAX_SLOPE_EDGES:
+                if max_slope[i] > edge:
+                    s_pen += 1
+            e_pen = 0
+            for edge in _RANGE_EDGES:
+                if relief > edge:
+                    e_pen += 1
+            
+            value = min(max(10.0 - s_pen - e_pen, 0.0), 10.0)
+            cls = 0
+            for edge in _SCORE_EDGES:
+                if value >= edge:
+                    cls += 1
+            
+            # Edges grow together, so the failing bands form a prefix
+            complexity = 0
+            for k in range(_COMPLEXITY_SLOPE_EDGES.shape[0]):
+                if slope >= _COMPLEXITY_SLOPE_EDGES[k] or relief >= _COMPLEXITY_RANGE_EDGES[k]:
+                    complexity += 1
+            
+            score[i] = value
+            buildability_class[i] = cls
+            slope_penalty[i] = s_pen
+            elevation_penalty[i] = e_pen
+            complexity_class[i] = complexity
+        return score, buildability_class, slope_penalty, elevation_penalty, complexity_class
+else:
+    def terrain_scores(
+        avg_slope: np.ndarray,
+        max_slope: np.ndarray,
+        elevation_range: np.ndarray
+    ):
+        """
+        Buildability score/class and terrain complexity class per site
+        
+        Returns (score, buildability class index, slope penalty, elevation
+        penalty, complexity class index).
+        """
+        slope_penalty = (
+            _SLOPE_PENALTIES[np.searchsorted(_SLOPE_EDGES, avg_slope, side='right')] +
+            np.searchsorted(_MAX_SLOPE_EDGES, max_slope, side='left')
+        )
+        elevation_penalty = np.searchsorted(_RANGE_EDGES, elevation_range, side='left')
+        score = np.clip(10.0 - slope_penalty - elevation_penalty, 0.0, 10.0)
+        buildability_class = np.searchsorted(_SCORE_EDGES, score, side='right').astype(np.uint8)
+        # Edges grow together, so the first band where both are below is
+        # the later of the two per-variable bands
+        complexity_class = np.maximum(
+            np.searchsorted(_COMPLEXITY_SLOPE_EDGES, avg_slope, side='right'),
+            np.searchsorted(_COMPLEXITY_RANGE_EDGES, elevation_range, side='right')
+        ).astype(np.uint8)
+        return score, buildability_class, slope_penalty, elevation_penalty, complexity_class
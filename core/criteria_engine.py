@@ -10,6 +10,9 @@ from config.criteria_config import CriteriaConfig
 
 logger = logging.getLogger(__name__)
 
+# Urbanization levels that always map to commercial land use
+_COMMERCIAL_URBANS = frozenset({"city_center", "urban"})
+
 
 class CriteriaEngine:
     """
@@ -91,7 +94,7 @@ class CriteriaEngine:
         urban = location_data.get("urbanization_level", "suburban")
         pop   = location_data.get("population_density", 500)
 
-        if urban in ("city_center", "urban") or pop > 2000:
+        if urban in _COMMERCIAL_URBANS or pop > 2000:
             return "commercial"
         elif urban == "rural" or pop < 100:
             return "agricultural"
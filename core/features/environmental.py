@@ -4,12 +4,87 @@
 # ============================================================================
 
 import ee
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
+from collections import Counter, OrderedDict
+import functools
+import hashlib
 import logging
+from operator import itemgetter
+import threading
+import time
+import numpy as np
+
+from core._numba_kernels import shannon
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+# ESA WorldCover class codes -> names
+_CLASS_NAMES = {
+    '10': 'tree_cover',
+    '20': 'shrubland',
+    '30': 'grassland',
+    '40': 'cropland',
+    '50': 'built_up',
+    '60': 'bare_vegetation',
+    '70': 'snow_ice',
+    '80': 'water_bodies',
+    '90': 'herbaceous_wetland',
+    '95': 'mangroves',
+    '100': 'moss_lichen'
+}
+
+# Tree cover, shrubland, grassland, herbaceous wetland
+_GREEN_CLASS_IDS = frozenset({'10', '20', '30', '90'})
+
+
+# Reducers are built lazily (Earth Engine may not be initialized at import)
+# and then reused by every request
+@functools.lru_cache(maxsize=None)
+def _ndvi_reducer() -> ee.Reducer:
+    """mean + min + max + stdDev reducer for NDVI statistics"""
+    return ee.Reducer.mean() \
+        .combine(ee.Reducer.min(), '', True) \
+        .combine(ee.Reducer.max(), '', True) \
+        .combine(ee.Reducer.stdDev(), '', True)
+
+
+@functools.lru_cache(maxsize=None)
+def _water_reducer() -> ee.Reducer:
+    """mean + max reducer for water occurrence"""
+    return ee.Reducer.mean().combine(ee.Reducer.max(), '', True)
+
+
+@functools.lru_cache(maxsize=None)
+def _permanent_water_reducer() -> ee.Reducer:
+    """Mean of the unmasked 0/1 permanent-water band (= parcel fraction)"""
+    return ee.Reducer.mean()
+
+
+# getInfo() retry policy: 3 attempts, 0.5s then 1s backoff
+_GET_INFO_ATTEMPTS = 3
+_GET_INFO_BACKOFF_SECONDS = 0.5
+
+
+def _get_info_with_retry(computed: ee.ComputedObject):
+    """
+    Call getInfo() with exponential backoff on failure
+    
+    The last error is re-raised once all attempts are exhausted.
+    """
+    for attempt in range(1, _GET_INFO_ATTEMPTS + 1):
+        try:
+            return computed.getInfo()
+        except Exception as e:
+            if attempt == _GET_INFO_ATTEMPTS:
+                raise
+            delay = _GET_INFO_BACKOFF_SECONDS * 2 ** (attempt - 1)
+            logger.warning(
+                f"Earth Engine request failed (attempt {attempt}/{_GET_INFO_ATTEMPTS}): "
+                f"{e} - retrying in {delay:.1f}s"
+            )
+            time.sleep(delay)
+
 
 class EnvironmentalExtractor:
     """
@@ -23,10 +98,24 @@ class EnvironmentalExtractor:
     
     DOES NOT:
     - Use fallback values without logging
-    - Cache results
     - Make assumptions about missing data
+    
+    Fetched statistics are memoized process-wide on
+    (geometry hash, date range, scale) so repeated analyses of the same
+    parcel skip Earth Engine entirely.
     """
     
+    # Process-wide LRU of fetched stats, shared by all instances
+    _CACHE_MAX_SIZE = 512
+    _stats_cache: 'OrderedDict[Tuple, Dict]' = OrderedDict()
+    _lock = threading.Lock()
+    
+    # Process-wide failure counts per component ('request', 'ndvi', ...)
+    extraction_errors_total: Counter = Counter()
+    
+    # More component fallbacks than this in one extraction is an error
+    _MAX_FALLBACKS = 1
+    
     def __init__(self):
         """Initialize environmental extractor"""
         self.scale = 10  # 10m for Sentinel-2
@@ -34,6 +123,22 @@ class EnvironmentalExtractor:
         # Date range for analysis (recent 1 year)
         self.end_date = datetime.now()
         self.start_date = self.end_date - timedelta(days=365)
+        
+        # Sentinel-2 collection filtered once per extractor; only the
+        # geometry filter is applied per call
+        self._s2_base = ee.ImageCollection('COPERNICUS/S2_SR_HARMONIZED') \
+            .filterDate(
+                self.start_date.strftime('%Y-%m-%d'),
+                self.end_date.strftime('%Y-%m-%d')
+            ) \
+            .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', 20))
+        
+        # JRC Global Surface Water is static (1984-2021): build the
+        # occurrence band and permanent-water mask once. Occurrence is masked
+        # where water was never seen, so the 0/1 band is unmasked to 0 and its
+        # mean is the permanent-water share of the whole parcel.
+        self._gsw_occurrence = ee.Image('JRC/GSW1_4/GlobalSurfaceWater').select('occurrence')
+        self._gsw_permanent = self._gsw_occurrence.gt(90).unmask(0).rename('perm')
     
     def extract(
         self,
@@ -59,103 +164,378 @@ class EnvironmentalExtractor:
         logger.info("Extracting environmental features from Earth Engine")
         
         try:
-            # Extract NDVI (vegetation)
-            ndvi_stats = self._extract_ndvi(ee_geometry)
+            # Fetch every reduction in a single Earth Engine round-trip
+            stats = self._fetch_stats(ee_geometry)
             
-            # Extract land cover
-            land_cover = self._extract_land_cover(ee_geometry)
+            return self._build_features(stats)
             
-            # Extract water occurrence
-            water_stats = self._extract_water_occurrence(ee_geometry)
+        except Exception as e:
+            logger.error(f"Environmental extraction failed: {e}", exc_info=True)
+            raise RuntimeError(f"Failed to extract environmental features: {str(e)}")
+    
+    def extract_batch(
+        self,
+        ee_geometries: List[ee.Geometry]
+    ) -> List[Dict]:
+        """
+        Extract environmental features for many parcels at once
+        
+        The per-parcel reductions are mapped server-side over a
+        FeatureCollection and fetched with a single getInfo() call, so a
+        batch of N parcels costs one round-trip instead of N.
+        
+        Args:
+            ee_geometries: Earth Engine geometries, one per parcel
             
-            # Calculate environmental score
-            env_score = self._calculate_environmental_score(
-                ndvi_stats,
-                land_cover,
-                water_stats
-            )
+        Returns:
+            List of environmental feature dicts, in input order
             
-            # Combine features
-            environmental_features = {
-                # Vegetation
-                'ndvi_avg': ndvi_stats['mean'],
-                'ndvi_min': ndvi_stats['min'],
-                'ndvi_max': ndvi_stats['max'],
-                'ndvi_std': ndvi_stats['std'],
-                'vegetation_health': ndvi_stats['health_category'],
-                
-                # Land cover
-                'land_cover_dominant': land_cover['dominant_class'],
-                'land_cover_distribution': land_cover['distribution'],
-                'land_cover_diversity': land_cover['diversity_index'],
-                
-                # Water
-                'water_occurrence_avg': water_stats['occurrence_avg'],
-                'water_occurrence_max': water_stats['occurrence_max'],
-                'permanent_water_percent': water_stats['permanent_water_percent'],
-                
-                # Derived metrics
-                'environmental_score': env_score,
-                'green_space_percent': self._calculate_green_space(ndvi_stats, land_cover),
-                
-                # Metadata
-                'data_quality': 'gee',
-                'date_range': f"{self.start_date.strftime('%Y-%m-%d')} to {self.end_date.strftime('%Y-%m-%d')}",
-                'scale_meters': self.scale
+        Raises:
+            RuntimeError: If extraction fails
+        """
+        if not ee_geometries:
+            return []
+        
+        if any(geometry is None for geometry in ee_geometries):
+            raise ValueError("ee_geometries contains None - Earth Engine geometry required")
+        
+        logger.info(
+            f"Extracting environmental features for {len(ee_geometries)} parcels "
+            f"from Earth Engine"
+        )
+        
+        try:
+            parcels = ee.FeatureCollection([
+                ee.Feature(geometry, {'idx': idx})
+                for idx, geometry in enumerate(ee_geometries)
+            ])
+            
+            # Drop the geometry from the response - only the stats are needed
+            def reduce_parcel(feature):
+                return ee.Feature(None, {
+                    'idx': feature.get('idx'),
+                    'stats': self._build_request(feature.geometry())
+                })
+            
+            try:
+                fetched = _get_info_with_retry(parcels.map(reduce_parcel))
+            except Exception:
+                self._record_error('request')
+                raise
+            
+            stats_by_idx = {
+                feature['properties']['idx']: feature['properties'].get('stats') or {}
+                for feature in fetched.get('features', [])
             }
             
-            logger.info(
-                f"Environmental extraction complete: "
-                f"NDVI {ndvi_stats['mean']:.2f}, "
-                f"land cover: {land_cover['dominant_class']}"
-            )
-            
-            return environmental_features
+            return [
+                self._build_features(stats_by_idx.get(idx, {}))
+                for idx in range(len(ee_geometries))
+            ]
             
         except Exception as e:
-            logger.error(f"Environmental extraction failed: {e}", exc_info=True)
+            logger.error(f"Batch environmental extraction failed: {e}", exc_info=True)
             raise RuntimeError(f"Failed to extract environmental features: {str(e)}")
     
-    def _extract_ndvi(
+    def _build_features(
+        self,
+        stats: Dict
+    ) -> Dict:
+        """
+        Turn the fetched statistics into the environmental feature dict
+        
+        Args:
+            stats: Combined stats dict as returned by _fetch_stats
+        """
+        # Post-process vegetation, land cover and water
+        ndvi_stats = self._extract_ndvi(stats.get('ndvi') or {})
+        land_cover = self._extract_land_cover(stats.get('land_cover') or {})
+        water_stats = self._extract_water_occurrence(stats)
+        
+        # Refuse to score on mostly-fabricated defaults
+        fallbacks = [
+            name for name, part in (
+                ('ndvi', ndvi_stats),
+                ('land_cover', land_cover),
+                ('water', water_stats)
+            )
+            if part.get('fallback')
+        ]
+        if len(fallbacks) > self._MAX_FALLBACKS:
+            raise RuntimeError(
+                f"Too many environmental components fell back to defaults: "
+                f"{', '.join(fallbacks)}"
+            )
+        
+        # Calculate environmental score
+        env_score = self._calculate_environmental_score(
+            ndvi_stats,
+            land_cover,
+            water_stats
+        )
+        
+        # Combine features
+        environmental_features = {
+            # Vegetation
+            'ndvi_avg': ndvi_stats['mean'],
+            'ndvi_min': ndvi_stats['min'],
+            'ndvi_max': ndvi_stats['max'],
+            'ndvi_std': ndvi_stats['std'],
+            'vegetation_health': ndvi_stats['health_category'],
+            
+            # Land cover
+            'land_cover_dominant': land_cover['dominant_class'],
+            'land_cover_distribution': land_cover['distribution'],
+            'land_cover_diversity': land_cover['diversity_index'],
+            
+            # Water
+            'water_occurrence_avg': water_stats['occurrence_avg'],
+            'water_occurrence_max': water_stats['occurrence_max'],
+            'permanent_water_percent': water_stats['permanent_water_percent'],
+            
+            # Derived metrics
+            'environmental_score': env_score,
+            'green_space_percent': self._calculate_green_space(ndvi_stats, land_cover),
+            
+            # Metadata
+            'data_quality': 'gee',
+            'date_range': f"{self.start_date.strftime('%Y-%m-%d')} to {self.end_date.strftime('%Y-%m-%d')}",
+            'scale_meters': self.scale
+        }
+        
+        logger.info(
+            f"Environmental extraction complete: "
+            f"NDVI {ndvi_stats['mean']:.2f}, "
+            f"land cover: {land_cover['dominant_class']}"
+        )
+        
+        return environmental_features
+    
+    def _fetch_stats(
+        self,
+        geometry: ee.Geometry
+    ) -> Dict:
+        """
+        Fetch all environmental statistics with one getInfo() call
+        
+        Every reduction is packed into a single server-side ee.Dictionary so
+        the extraction costs one HTTPS round-trip instead of five. Results
+        are served from the process-wide cache when available.
+        """
+        stats = self.cached_stats(geometry)
+        
+        logger.debug(f"Environmental stats cache_hit={stats is not None}")
+        
+        if stats is None:
+            try:
+                stats = _get_info_with_retry(self.build_expression(geometry)) or {}
+            except Exception:
+                self._record_error('request')
+                raise
+            
+            self.remember_stats(geometry, stats)
+        
+        return stats
+    
+    def cached_stats(
+        self,
+        geometry: ee.Geometry
+    ) -> Optional[Dict]:
+        """Look up memoized stats for a geometry (None on a miss)"""
+        key = self._cache_key(geometry)
+        
+        with self._lock:
+            stats = self._stats_cache.get(key)
+            if stats is not None:
+                self._stats_cache.move_to_end(key)
+        
+        return stats
+    
+    def remember_stats(
+        self,
+        geometry: ee.Geometry,
+        stats: Dict
+    ):
+        """Memoize fetched stats for a geometry, evicting the oldest entry"""
+        key = self._cache_key(geometry)
+        
+        with self._lock:
+            self._stats_cache[key] = stats
+            if len(self._stats_cache) > self._CACHE_MAX_SIZE:
+                self._stats_cache.popitem(last=False)
+    
+    def build_expression(
         self,
         geometry: ee.Geometry
+    ) -> ee.Dictionary:
+        """
+        Server-side dictionary of all environmental reductions
+        
+        Not evaluated here, so callers can fuse it with other requests into
+        a single getInfo(); feed the fetched result to from_stats().
+        """
+        return self._build_request(geometry)
+    
+    def from_stats(
+        self,
+        geometry: ee.Geometry,
+        stats: Dict
     ) -> Dict:
+        """Build environmental features from stats fetched via build_expression()"""
+        stats = stats or {}
+        self.remember_stats(geometry, stats)
+        return self._build_features(stats)
+    
+    def _cache_key(
+        self,
+        geometry: ee.Geometry
+    ) -> Tuple:
+        """
+        Build the stats cache key for a geometry
+        
+        Hashes the client-side serialized geometry, so computing the key
+        needs no Earth Engine round-trip.
+        """
+        geometry_hash = hashlib.blake2b(
+            geometry.serialize().encode('utf-8'),
+            digest_size=16
+        ).hexdigest()
+        
+        return (
+            geometry_hash,
+            self.start_date.strftime('%Y-%m-%d'),
+            self.end_date.strftime('%Y-%m-%d'),
+            self.scale
+        )
+    
+    @classmethod
+    def _record_error(cls, component: str):
+        """Count an extraction failure for the given component"""
+        with cls._lock:
+            cls.extraction_errors_total[component] += 1
+    
+    @classmethod
+    def clear_cache(cls):
+        """Drop all memoized environmental stats"""
+        with cls._lock:
+            cls._stats_cache.clear()
+    
+    def _build_request(
+        self,
+        geometry: ee.Geometry
+    ) -> ee.Dictionary:
+        """Build the server-side dictionary of all environmental reductions"""
+        return ee.Dictionary({
+            'ndvi': self._ndvi_reduction(geometry),
+            'land_cover': self._land_cover_reduction(geometry),
+            'water': self._water_reduction(geometry),
+            'permanent_water': self._permanent_water_reduction(geometry)
+        })
+    
+    def _ndvi_reduction(
+        self,
+        geometry: ee.Geometry
+    ) -> ee.Dictionary:
         """
-        Extract NDVI (Normalized Difference Vegetation Index)
+        Build NDVI (Normalized Difference Vegetation Index) statistics
         
         Uses Sentinel-2 imagery from past year
         """
+        # Calculate NDVI for each image (NDVI band only)
+        def calculate_ndvi(image):
+            # normalizedDifference works in float; B8/B4 are uint16 and an
+            # expression would divide them as integers
+            return image.normalizedDifference(['B8', 'B4']).rename('NDVI')
+        
+        # Get median NDVI
+        ndvi_median = self._s2_base \
+            .filterBounds(geometry) \
+            .map(calculate_ndvi) \
+            .median()
+        
+        return ndvi_median.reduceRegion(
+            reducer=_ndvi_reducer(),
+            geometry=geometry,
+            scale=self.scale,
+            maxPixels=self._max_pixels(geometry, self.scale)
+        )
+    
+    def _land_cover_reduction(
+        self,
+        geometry: ee.Geometry
+    ) -> ee.Dictionary:
+        """
+        Build land cover histogram
+        
+        Uses ESA WorldCover 10m dataset
+        """
+        # Get ESA WorldCover (most recent)
+        worldcover = ee.ImageCollection('ESA/WorldCover/v200').first()
+        
+        return worldcover.reduceRegion(
+            reducer=ee.Reducer.frequencyHistogram(),
+            geometry=geometry,
+            scale=10,
+            maxPixels=self._max_pixels(geometry, 10)
+        )
+    
+    def _water_reduction(
+        self,
+        geometry: ee.Geometry
+    ) -> ee.Dictionary:
+        """
+        Build water occurrence statistics from JRC Global Surface Water
+        
+        Shows historical water presence (1984-2021)
+        """
+        # Water occurrence (0-100%, how often water was present)
+        return self._gsw_occurrence.reduceRegion(
+            reducer=_water_reducer(),
+            geometry=geometry,
+            scale=30,
+            maxPixels=self._max_pixels(geometry, 30)
+        )
+    
+    def _permanent_water_reduction(
+        self,
+        geometry: ee.Geometry
+    ) -> ee.Dictionary:
+        """Build the parcel fraction of permanent water (occurrence > 90%)"""
+        return self._gsw_permanent.reduceRegion(
+            reducer=_permanent_water_reducer(),
+            geometry=geometry,
+            scale=30,
+            maxPixels=self._max_pixels(geometry, 30)
+        )
+    
+    @staticmethod
+    def _max_pixels(
+        geometry: ee.Geometry,
+        scale: float
+    ) -> ee.Number:
+        """
+        Geometry-derived maxPixels bound for a reduction at the given scale
+        
+        Expected pixel count with a 1.5x margin, clamped to [1e4, 1e8].
+        Evaluated server-side as part of the same request.
+        """
+        return ee.Number(geometry.area()) \
+            .divide(scale * scale) \
+            .multiply(1.5) \
+            .max(1e4) \
+            .min(1e8)
+    
+    def _extract_ndvi(
+        self,
+        stats: Dict
+    ) -> Dict:
+        """
+        Extract NDVI statistics from the fetched reduction
+        
+        Args:
+            stats: NDVI reduceRegion output (NDVI_mean, NDVI_min, ...)
+        """
         try:
-            # Get Sentinel-2 collection
-            s2 = ee.ImageCollection('COPERNICUS/S2_SR_HARMONIZED') \
-                .filterBounds(geometry) \
-                .filterDate(
-                    self.start_date.strftime('%Y-%m-%d'),
-                    self.end_date.strftime('%Y-%m-%d')
-                ) \
-                .filter(ee.Filter.lt('CLOUDY_PIXEL_PERCENTAGE', 20))
-            
-            # Calculate NDVI for each image
-            def calculate_ndvi(image):
-                ndvi = image.normalizedDifference(['B8', 'B4']).rename('NDVI')
-                return image.addBands(ndvi)
-            
-            s2_ndvi = s2.map(calculate_ndvi)
-            
-            # Get median NDVI
-            ndvi_median = s2_ndvi.select('NDVI').median()
-            
-            # Extract statistics
-            stats = ndvi_median.reduceRegion(
-                reducer=ee.Reducer.mean()
-                    .combine(ee.Reducer.min(), '', True)
-                    .combine(ee.Reducer.max(), '', True)
-                    .combine(ee.Reducer.stdDev(), '', True),
-                geometry=geometry,
-                scale=self.scale,
-                maxPixels=1e8
-            ).getInfo()
-            
             mean_ndvi = float(stats.get('NDVI_mean', 0.5))
             
             # Categorize vegetation health
@@ -178,65 +558,53 @@ class EnvironmentalExtractor:
             
         except Exception as e:
             logger.warning(f"NDVI extraction failed: {e}")
+            self._record_error('ndvi')
             # Return conservative estimates
             return {
                 'mean': 0.5,
                 'min': 0.2,
                 'max': 0.8,
                 'std': 0.15,
-                'health_category': 'unknown'
+                'health_category': 'unknown',
+                'fallback': True
             }
     
     def _extract_land_cover(
         self,
-        geometry: ee.Geometry
+        histogram: Dict
     ) -> Dict:
         """
-        Extract land cover classification
+        Extract land cover classification from the fetched histogram
         
-        Uses ESA WorldCover 10m dataset
+        Args:
+            histogram: WorldCover frequencyHistogram output ({'Map': {...}})
         """
         try:
-            # Get ESA WorldCover (most recent)
-            worldcover = ee.ImageCollection('ESA/WorldCover/v200').first()
-            
-            # Extract land cover distribution
-            histogram = worldcover.reduceRegion(
-                reducer=ee.Reducer.frequencyHistogram(),
-                geometry=geometry,
-                scale=10,
-                maxPixels=1e8
-            ).getInfo()
-            
-            cover_hist = histogram.get('Map', {})
-            
-            # Convert class codes to names
-            class_names = {
-                '10': 'tree_cover',
-                '20': 'shrubland',
-                '30': 'grassland',
-                '40': 'cropland',
-                '50': 'built_up',
-                '60': 'bare_vegetation',
-                '70': 'snow_ice',
-                '80': 'water_bodies',
-                '90': 'herbaceous_wetland',
-                '95': 'mangroves',
-                '100': 'moss_lichen'
+            # WorldCover histogram keys are always class-code strings
+            cover_hist = histogram.get('Map', {}) or {}
+            codes = list(cover_hist)
+            
+            # Calculate distribution in one vectorized pass
+            counts = np.fromiter(cover_hist.values(), dtype=np.float64, count=len(codes))
+            total_pixels = counts.sum() or 1.0
+            percents = counts * (100.0 / total_pixels)
+            
+            distribution = {
+                _CLASS_NAMES.get(code, f'class_{code}'): round(float(percent), 2)
+                for code, percent in zip(codes, percents)
             }
             
-            # Calculate distribution
-            total_pixels = sum(cover_hist.values())
-            distribution = {}
-            
-            for code, count in cover_hist.items():
-                class_name = class_names.get(str(code), f'class_{code}')
-                percent = (count / total_pixels) * 100
-                distribution[class_name] = round(percent, 2)
+            # Green space straight from class ids, no name translation
+            green_mask = np.fromiter(
+                (code in _GREEN_CLASS_IDS for code in codes),
+                dtype=bool,
+                count=len(codes)
+            )
+            green_percent = float(percents[green_mask].sum())
             
             # Find dominant class
             if distribution:
-                dominant_class = max(distribution, key=distribution.get)
+                dominant_class = max(distribution.items(), key=itemgetter(1))[0]
             else:
                 dominant_class = 'unknown'
             
@@ -246,58 +614,41 @@ class EnvironmentalExtractor:
             return {
                 'dominant_class': dominant_class,
                 'distribution': distribution,
-                'diversity_index': diversity
+                'diversity_index': diversity,
+                'green_percent': green_percent
             }
             
         except Exception as e:
             logger.warning(f"Land cover extraction failed: {e}")
+            self._record_error('land_cover')
             return {
                 'dominant_class': 'unknown',
                 'distribution': {},
-                'diversity_index': 0.0
+                'diversity_index': 0.0,
+                'green_percent': 0.0,
+                'fallback': True
             }
     
     def _extract_water_occurrence(
         self,
-        geometry: ee.Geometry
+        stats: Dict
     ) -> Dict:
         """
-        Extract water occurrence from JRC Global Surface Water
+        Extract water occurrence from the fetched JRC reductions
         
-        Shows historical water presence (1984-2021)
+        Args:
+            stats: Combined stats dict with 'water' and 'permanent_water'
+                   entries
         """
         try:
-            # Get JRC Global Surface Water
-            water = ee.Image('JRC/GSW1_4/GlobalSurfaceWater')
+            water = stats.get('water') or {}
+            # GSW occurrence is masked where water was never seen: null means 0
+            occurrence_avg = float(water.get('occurrence_mean') or 0)
+            occurrence_max = float(water.get('occurrence_max') or 0)
             
-            # Water occurrence (0-100%, how often water was present)
-            occurrence = water.select('occurrence')
-            
-            # Extract statistics
-            stats = occurrence.reduceRegion(
-                reducer=ee.Reducer.mean()
-                    .combine(ee.Reducer.max(), '', True),
-                geometry=geometry,
-                scale=30,
-                maxPixels=1e8
-            ).getInfo()
-            
-            occurrence_avg = float(stats.get('occurrence_mean', 0))
-            occurrence_max = float(stats.get('occurrence_max', 0))
-            
-            # Permanent water (occurrence > 90%)
-            permanent_mask = occurrence.gt(90)
-            permanent_area = permanent_mask.reduceRegion(
-                reducer=ee.Reducer.sum(),
-                geometry=geometry,
-                scale=30,
-                maxPixels=1e8
-            ).getInfo()
-            
-            # Calculate percent of area with permanent water
-            permanent_pixels = float(permanent_area.get('occurrence', 0))
-            total_pixels = geometry.area().divide(900).getInfo()  # 30m pixels
-            permanent_percent = (permanent_pixels / total_pixels) * 100 if total_pixels > 0 else 0
+            # Calculate percent of area with permanent water (mean of 0/1 band)
+            permanent = stats.get('permanent_water') or {}
+            permanent_percent = float(permanent.get('perm') or 0) * 100
             
             return {
                 'occurrence_avg': occurrence_avg,
@@ -307,10 +658,12 @@ class EnvironmentalExtractor:
             
         except Exception as e:
             logger.warning(f"Water occurrence extraction failed: {e}")
+            self._record_error('water')
             return {
                 'occurrence_avg': 0.0,
                 'occurrence_max': 0.0,
-                'permanent_water_percent': 0.0
+                'permanent_water_percent': 0.0,
+                'fallback': True
             }
     
     def _calculate_diversity_index(
@@ -325,15 +678,17 @@ class EnvironmentalExtractor:
         if not distribution:
             return 0.0
         
-        import math
-        
         # Convert percentages to proportions
-        proportions = [p / 100 for p in distribution.values() if p > 0]
+        proportions = np.fromiter(
+            distribution.values(),
+            dtype=np.float64,
+            count=len(distribution)
+        ) / 100.0
         
         # Shannon index: H = -Σ(pi * ln(pi))
-        diversity = -sum(p * math.log(p) for p in proportions)
+        diversity = shannon(proportions)
         
-        return round(diversity, 3)
+        return round(float(diversity), 3)
     
     def _calculate_environmental_score(
         self,
@@ -383,18 +738,4 @@ class EnvironmentalExtractor:
         
         Based on NDVI and land cover
         """
-        distribution = land_cover['distribution']
-        
-        green_classes = [
-            'tree_cover',
-            'shrubland',
-            'grassland',
-            'herbaceous_wetland'
-        ]
-        
-        green_percent = sum(
-            distribution.get(cls, 0)
-            for cls in green_classes
-        )
-        
-        return round(green_percent, 1)
+        return round(land_cover.get('green_percent', 0.0), 1)
@@ -4,12 +4,77 @@
 # ============================================================================
 
 import ee
-from typing import Dict, Optional
+import functools
+import hashlib
+from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 import logging
+import math
+import threading
 import numpy as np
 
+from core._numba_kernels import terrain_scores
+from core.models.feature_set import TerrainFeatures
+from utils.cache_manager import CacheManager
+
 logger = logging.getLogger(__name__)
 
+# DEMs published as tiled ImageCollections rather than single images
+_COLLECTION_DATASETS = frozenset({'JAXA/ALOS/AW3D30/V3_2'})
+
+# Feature groups extract() returns by default; add 'slope_histogram' to
+# also reduce the slope histogram
+DEFAULT_FEATURES = frozenset({'elevation', 'slope', 'aspect'})
+
+# Slope histogram range (degrees) and bin count
+_SLOPE_HIST_MIN = 0
+_SLOPE_HIST_MAX = 90
+_SLOPE_HIST_BINS = 9
+_SLOPE_HIST_WIDTH = (_SLOPE_HIST_MAX - _SLOPE_HIST_MIN) / _SLOPE_HIST_BINS
+
+# Reducers are built lazily (Earth Engine may not be initialized at import)
+# and then reused by every request
+@functools.lru_cache(maxsize=None)
+def _stats_reducer() -> ee.Reducer:
+    """mean + min + max + stdDev reducer for elevation"""
+    return ee.Reducer.mean() \
+        .combine(ee.Reducer.min(), '', True) \
+        .combine(ee.Reducer.max(), '', True) \
+        .combine(ee.Reducer.stdDev(), '', True)
+
+
+@functools.lru_cache(maxsize=None)
+def _slope_reducer() -> ee.Reducer:
+    """p0/p50/p95/p100 + mean + stdDev reducer for slope"""
+    return ee.Reducer.percentile([0, 50, 95, 100]) \
+        .combine(ee.Reducer.mean(), '', True) \
+        .combine(ee.Reducer.stdDev(), '', True)
+
+
+@functools.lru_cache(maxsize=None)
+def _slope_histogram_reducer() -> ee.Reducer:
+    """Slope reducer plus a 0-90° histogram in 10° bins"""
+    return _slope_reducer().combine(
+        ee.Reducer.fixedHistogram(_SLOPE_HIST_MIN, _SLOPE_HIST_MAX, _SLOPE_HIST_BINS),
+        '',
+        True
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _aspect_reducer() -> ee.Reducer:
+    """mean + mode reducer for aspect"""
+    return ee.Reducer.mean().combine(ee.Reducer.mode(), '', True)
+
+
+# Class names indexed by the terrain_scores kernel's class indices
+_BUILDABILITY_CLASSES = np.array(['difficult', 'challenging', 'moderate', 'good', 'excellent'])
+_COMPLEXITY_CLASSES = np.array(['flat', 'gentle', 'rolling', 'hilly', 'mountainous'])
+
+# Cardinal directions in 45-degree steps, starting at north
+_DIRS = ('N', 'NE', 'E', 'SE', 'S', 'SW', 'W', 'NW')
+
 
 class TerrainExtractor:
     """
@@ -24,12 +89,41 @@ class TerrainExtractor:
     DOES NOT:
     - Use fallback values
     - Guess missing data
-    - Cache results (caching is pipeline's job)
+    - Cache results on its own (the pipeline opts in via cache_dir)
     """
     
-    def __init__(self):
-        """Initialize terrain extractor"""
+    TERRAIN_CACHE_TTL_HOURS = 30 * 24
+    
+    # Shared pool for extract_async; extraction time is almost entirely
+    # spent waiting on Earth Engine, so a few threads overlap many sites
+    _executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='terrain')
+    
+    # DEM chosen for each 1°x1° tile, shared by all extractors so nearby
+    # sites skip the server-side coverage probes
+    DEM_TILE_CACHE_SIZE = 1024
+    _dem_by_tile: 'OrderedDict[Tuple[int, int], str]' = OrderedDict()
+    _dem_lock = threading.Lock()
+    
+    def __init__(self, tile_scale: int = 4, cache_dir: Optional[str] = None):
+        """
+        Initialize terrain extractor
+        
+        Args:
+            tile_scale: Earth Engine tileScale for the reductions; higher
+                values split the work into smaller tiles (more parallel,
+                less memory per tile) so large regions don't hit
+                'User memory limit exceeded'
+            cache_dir: Directory for the terrain feature cache (None
+                disables it)
+        """
         self.scale = 30  # 30m resolution for SRTM
+        self.tile_scale = tile_scale
+        
+        # Opt-in disk cache of extracted features, keyed by parcel geometry
+        self._cache = (
+            CacheManager(cache_dir, ttl_hours=self.TERRAIN_CACHE_TTL_HOURS)
+            if cache_dir else None
+        )
         
         # Dataset priorities (best to fallback)
         self.elevation_datasets = [
@@ -38,15 +132,50 @@ class TerrainExtractor:
             'JAXA/ALOS/AW3D30/V3_2'  # ALOS World 3D
         ]
     
+    def extract_async(
+        self,
+        ee_geometry: ee.Geometry,
+        centroid: Optional[List[float]] = None,
+        features: frozenset = DEFAULT_FEATURES,
+        geometry=None
+    ) -> Future:
+        """
+        Start extracting terrain features in the background
+        
+        Submit several sites and gather the futures to overlap their Earth
+        Engine round-trips.
+        
+        Args:
+            ee_geometry: Earth Engine geometry
+            centroid: Optional [lon, lat] of the site (see extract)
+            features: Feature groups to extract (see extract)
+            geometry: Optional Shapely geometry of the site (see extract)
+            
+        Returns:
+            Future resolving to the extract() result (or raising its error)
+        """
+        return self._executor.submit(self.extract, ee_geometry, centroid, features, geometry)
+    
     def extract(
         self,
-        ee_geometry: ee.Geometry
+        ee_geometry: ee.Geometry,
+        centroid: Optional[List[float]] = None,
+        features: frozenset = DEFAULT_FEATURES,
+        geometry=None
     ) -> Dict:
         """
         Extract all terrain features
         
         Args:
             ee_geometry: Earth Engine geometry
+            centroid: Optional [lon, lat] of the site. When given, the DEM
+                chosen for its 1°x1° tile is remembered and reused for
+                later sites in the same tile
+            features: Feature groups to extract. The slope histogram is
+                only reduced when 'slope_histogram' is included; otherwise
+                it comes back empty
+            geometry: Optional Shapely geometry of the site, used as the
+                disk cache key when the cache is enabled
             
         Returns:
             Dict with terrain features
@@ -59,203 +188,498 @@ class TerrainExtractor:
         
         logger.info("Extracting terrain features from Earth Engine")
         
+        cached = self.cached(geometry, features)
+        if cached is not None:
+            logger.info("Terrain features served from cache")
+            return cached
+        
         try:
-            # Get elevation DEM
-            dem = self._get_best_dem(ee_geometry)
+            # Fetch DEM selection, elevation, slope and aspect statistics
+            # in one round-trip
+            stats = self.build_expression(ee_geometry, centroid, features).getInfo()
+            
+            return self.from_stats(stats, centroid, features, geometry)
             
-            # Extract elevation statistics
-            elevation_stats = self._extract_elevation_stats(dem, ee_geometry)
+        except Exception as e:
+            logger.error(f"Terrain extraction failed: {e}", exc_info=True)
+            raise RuntimeError(f"Failed to extract terrain features: {str(e)}")
+    
+    def cached(
+        self,
+        geometry,
+        features: frozenset = DEFAULT_FEATURES
+    ) -> Optional[Dict]:
+        """Look up a site's features in the disk cache (None on a miss)"""
+        cache_key = self._cache_key(geometry, 'slope_histogram' in features)
+        if cache_key is None:
+            return None
+        return self._cache.get(cache_key)
+    
+    def build_expression(
+        self,
+        ee_geometry: ee.Geometry,
+        centroid: Optional[List[float]] = None,
+        features: frozenset = DEFAULT_FEATURES
+    ) -> ee.Dictionary:
+        """
+        Server-side dictionary of all terrain statistics for a site
+        
+        Not evaluated here, so callers can fuse it with other requests into
+        a single getInfo(); feed the fetched result to from_stats().
+        """
+        return self._build_request(
+            ee_geometry,
+            self._cached_dem_id(self._dem_tile(centroid)),
+            with_histogram='slope_histogram' in features
+        )
+    
+    def from_stats(
+        self,
+        stats: Dict,
+        centroid: Optional[List[float]] = None,
+        features: frozenset = DEFAULT_FEATURES,
+        geometry=None
+    ) -> Dict:
+        """
+        Build terrain features from stats fetched via build_expression()
+        
+        Also records the DEM chosen for the centroid's tile and stores the
+        result in the disk cache, exactly as extract() does.
+        """
+        terrain_features = self._build_features([stats or {}])[0]
+        self._remember_dem_id(self._dem_tile(centroid), terrain_features.dem_source)
+        
+        result = terrain_features.to_dict()
+        cache_key = self._cache_key(geometry, 'slope_histogram' in features)
+        if cache_key is not None:
+            self._cache.set(cache_key, result)
+        
+        return result
+    
+    def extract_many(
+        self,
+        ee_geometries: List[ee.Geometry],
+        features: frozenset = DEFAULT_FEATURES
+    ) -> List[Dict]:
+        """
+        Extract terrain features for many sites at once
+        
+        Same as extract_records(), but returns the legacy feature dicts.
+        """
+        return [
+            record.to_dict()
+            for record in self.extract_records(ee_geometries, features)
+        ]
+    
+    def extract_records(
+        self,
+        ee_geometries: List[ee.Geometry],
+        features: frozenset = DEFAULT_FEATURES
+    ) -> List[TerrainFeatures]:
+        """
+        Extract terrain features for many sites at once
+        
+        The per-site DEM selection and reductions are mapped server-side
+        over a FeatureCollection and fetched with a single getInfo() call,
+        so a batch of N sites costs one round-trip instead of N.
+        
+        Args:
+            ee_geometries: Earth Engine geometries, one per site
+            features: Feature groups to extract (see extract)
             
-            # Calculate terrain derivatives
-            slope_img = ee.Terrain.slope(dem)
-            aspect_img = ee.Terrain.aspect(dem)
+        Returns:
+            TerrainFeatures records, in input order (feature_set.to_arrays
+            turns them into columns)
             
-            # Extract slope statistics
-            slope_stats = self._extract_slope_stats(slope_img, ee_geometry)
+        Raises:
+            RuntimeError: If Earth Engine fails or data unavailable
+        """
+        if not ee_geometries:
+            return []
+        
+        if any(geometry is None for geometry in ee_geometries):
+            raise ValueError("ee_geometries contains None - Earth Engine geometry required")
+        
+        logger.info(
+            f"Extracting terrain features for {len(ee_geometries)} sites "
+            f"from Earth Engine"
+        )
+        
+        with_histogram = 'slope_histogram' in features
+        
+        try:
+            sites = ee.FeatureCollection([
+                ee.Feature(geometry, {'idx': idx})
+                for idx, geometry in enumerate(ee_geometries)
+            ])
             
-            # Extract aspect statistics
-            aspect_stats = self._extract_aspect_stats(aspect_img, ee_geometry)
+            # Drop the geometry from the response - only the stats are needed
+            def reduce_site(feature):
+                return ee.Feature(None, {
+                    'idx': feature.get('idx'),
+                    'stats': self._build_request(
+                        feature.geometry(),
+                        with_histogram=with_histogram
+                    )
+                })
             
-            # Calculate buildability score
-            buildability = self._calculate_buildability(
-                elevation_stats,
-                slope_stats
-            )
+            fetched = sites.map(reduce_site).getInfo()
             
-            # Combine all features
-            terrain_features = {
-                # Elevation
-                'elevation_avg': elevation_stats['mean'],
-                'elevation_min': elevation_stats['min'],
-                'elevation_max': elevation_stats['max'],
-                'elevation_range': elevation_stats['max'] - elevation_stats['min'],
-                'elevation_std': elevation_stats['std'],
-                
-                # Slope
-                'slope_avg': slope_stats['mean'],
-                'slope_min': slope_stats['min'],
-                'slope_max': slope_stats['max'],
-                'slope_std': slope_stats['std'],
-                'slope_histogram': slope_stats['histogram'],
-                
-                # Aspect
-                'aspect_avg': aspect_stats['mean'],
-                'aspect_dominant': aspect_stats['dominant_direction'],
-                'aspect_distribution': aspect_stats['distribution'],
-                
-                # Derived metrics
-                'buildability_score': buildability['score'],
-                'buildability_class': buildability['class'],
-                'terrain_complexity': self._calculate_terrain_complexity(
-                    elevation_stats,
-                    slope_stats
-                ),
-                
-                # Metadata
-                'data_quality': 'gee',
-                'dem_source': dem.get('system:id').getInfo() if hasattr(dem, 'get') else 'unknown',
-                'scale_meters': self.scale
+            stats_by_idx = {
+                feature['properties']['idx']: feature['properties'].get('stats') or {}
+                for feature in fetched.get('features', [])
             }
             
-            logger.info(
-                f"Terrain extraction complete: "
-                f"elevation {elevation_stats['mean']:.0f}m, "
-                f"slope {slope_stats['mean']:.1f}°"
-            )
-            
-            return terrain_features
+            return self._build_features([
+                stats_by_idx.get(idx, {})
+                for idx in range(len(ee_geometries))
+            ])
             
         except Exception as e:
-            logger.error(f"Terrain extraction failed: {e}", exc_info=True)
+            logger.error(f"Batch terrain extraction failed: {e}", exc_info=True)
             raise RuntimeError(f"Failed to extract terrain features: {str(e)}")
     
+    def _build_features(
+        self,
+        stats_list: List[Dict]
+    ) -> List[TerrainFeatures]:
+        """
+        Turn the fetched statistics into terrain feature records
+        
+        Buildability is scored for all sites in one vectorized pass.
+        
+        Args:
+            stats_list: Combined stats dicts as returned by _build_request
+            
+        Raises:
+            RuntimeError: If no DEM covers one of the regions
+        """
+        parsed = []
+        for stats in stats_list:
+            # DEM selection happens server-side; an all-null elevation
+            # reduction means none of the datasets covers the region
+            if not any(value is not None for value in (stats.get('elevation') or {}).values()):
+                raise RuntimeError(
+                    "No elevation data available for this region. "
+                    "Tried: " + ", ".join(self.elevation_datasets)
+                )
+            
+            parsed.append((
+                self._extract_elevation_stats(stats.get('elevation') or {}),
+                self._extract_slope_stats(stats.get('slope') or {}),
+                self._extract_aspect_stats(stats.get('aspect') or {})
+            ))
+        
+        # Calculate buildability scores and complexity classes
+        buildability = self._calculate_buildability_batch({
+            'avg_slope': np.array([slope['mean'] for _, slope, _ in parsed], dtype=float),
+            # P95 rather than max: one noisy DEM pixel should not cost a band
+            'max_slope': np.array([slope['p95'] for _, slope, _ in parsed], dtype=float),
+            'elevation_range': np.array(
+                [elev['max'] - elev['min'] for elev, _, _ in parsed], dtype=float
+            )
+        })
+        
+        return [
+            self._combine_features(
+                stats, *parsed[i],
+                float(buildability['score'][i]), str(buildability['class'][i]),
+                str(buildability['complexity'][i])
+            )
+            for i, stats in enumerate(stats_list)
+        ]
+    
+    def _combine_features(
+        self,
+        stats: Dict,
+        elevation_stats: Dict,
+        slope_stats: Dict,
+        aspect_stats: Dict,
+        buildability_score: float,
+        buildability_class: str,
+        terrain_complexity: str
+    ) -> TerrainFeatures:
+        """Combine the parsed statistics of one site into its feature record"""
+        terrain_features = TerrainFeatures(
+            # Elevation
+            elevation_avg=elevation_stats['mean'],
+            elevation_min=elevation_stats['min'],
+            elevation_max=elevation_stats['max'],
+            elevation_range=elevation_stats['max'] - elevation_stats['min'],
+            elevation_std=elevation_stats['std'],
+            
+            # Slope
+            slope_avg=slope_stats['mean'],
+            slope_min=slope_stats['min'],
+            slope_max=slope_stats['max'],
+            slope_std=slope_stats['std'],
+            slope_p95=slope_stats['p95'],
+            # Plain lists keep the feature dict JSON-serializable
+            slope_histogram={
+                key: values.tolist()
+                for key, values in slope_stats['histogram'].items()
+            },
+            
+            # Aspect
+            aspect_avg=aspect_stats['mean'],
+            aspect_dominant=aspect_stats['dominant_direction'],
+            aspect_distribution=aspect_stats['distribution'],
+            
+            # Derived metrics
+            buildability_score=buildability_score,
+            buildability_class=buildability_class,
+            terrain_complexity=terrain_complexity,
+            
+            # Metadata
+            data_quality='gee',
+            dem_source=stats.get('dem_source') or 'unknown',
+            scale_meters=self.scale
+        )
+        
+        logger.info(
+            f"Terrain extraction complete: "
+            f"elevation {elevation_stats['mean']:.0f}m, "
+            f"slope {slope_stats['mean']:.1f}°"
+        )
+        
+        return terrain_features
+    
     def _get_best_dem(
         self,
         geometry: ee.Geometry
-    ) -> ee.Image:
+    ) -> Tuple[ee.Image, ee.String]:
         """
         Get best available DEM for the region
         
+        The choice is made server-side: the first dataset (in priority
+        order) with a valid pixel at the geometry centroid wins. Nothing is
+        fetched here; the selection is evaluated as part of the stats
+        request, which comes back empty if no dataset covers the region.
+        
         Args:
             geometry: Region of interest
             
         Returns:
-            ee.Image with elevation data
-            
-        Raises:
-            RuntimeError: If no DEM available
-        """
-        for dataset_id in self.elevation_datasets:
-            try:
-                logger.debug(f"Attempting DEM: {dataset_id}")
-                
-                dem = ee.Image(dataset_id)
-                
-                # Test if data exists in region
-                test_value = dem.reduceRegion(
+            (ee.Image with elevation data, its dataset id), both server-side
+        """
+        centroid = geometry.centroid(1)
+        
+        # Build the If-chain from the lowest priority dataset upwards. The
+        # id is selected alongside the image, since mosaicked collections
+        # carry no system:id of their own
+        dem = self._load_dem(self.elevation_datasets[-1])
+        dem_id = ee.String(self.elevation_datasets[-1])
+        for dataset_id in reversed(self.elevation_datasets[:-1]):
+            candidate = self._load_dem(dataset_id)
+            has_data = ee.Number(
+                candidate.select(0).mask().reduceRegion(
                     reducer=ee.Reducer.first(),
-                    geometry=geometry.centroid(),
+                    geometry=centroid,
                     scale=self.scale,
                     maxPixels=1
-                ).getInfo()
-                
-                if test_value:
-                    logger.info(f"Using DEM: {dataset_id}")
-                    return dem
-                    
-            except Exception as e:
-                logger.warning(f"DEM {dataset_id} not available: {e}")
-                continue
-        
-        raise RuntimeError(
-            "No elevation data available for this region. "
-            "Tried: " + ", ".join(self.elevation_datasets)
-        )
+                ).values().get(0)
+            ).gt(0)
+            dem = ee.Image(ee.Algorithms.If(has_data, candidate, dem))
+            dem_id = ee.String(ee.Algorithms.If(has_data, dataset_id, dem_id))
+        
+        return dem, dem_id
+    
+    def _cache_key(self, geometry, with_histogram: bool) -> Optional[str]:
+        """Disk cache key for a site: geometry WKB hash + request settings"""
+        if self._cache is None or geometry is None:
+            return None
+        digest = hashlib.sha1(geometry.wkb).hexdigest()
+        return f"terrain:{digest}:{self.scale}:{self.tile_scale}:{int(with_histogram)}"
+    
+    @staticmethod
+    def _dem_tile(centroid: Optional[List[float]]) -> Optional[Tuple[int, int]]:
+        """Quantize a [lon, lat] centroid to its 1°x1° tile"""
+        if centroid is None:
+            return None
+        lon, lat = centroid
+        return (math.floor(lon), math.floor(lat))
     
-    def _extract_elevation_stats(
+    def _cached_dem_id(self, tile: Optional[Tuple[int, int]]) -> Optional[str]:
+        """Look up the DEM already chosen for a tile"""
+        if tile is None:
+            return None
+        with self._dem_lock:
+            dataset_id = self._dem_by_tile.get(tile)
+            if dataset_id is not None:
+                self._dem_by_tile.move_to_end(tile)
+        return dataset_id
+    
+    def _remember_dem_id(self, tile: Optional[Tuple[int, int]], dataset_id: str):
+        """Record the DEM chosen for a tile, evicting the oldest entry"""
+        if tile is None or dataset_id not in self.elevation_datasets:
+            return
+        with self._dem_lock:
+            self._dem_by_tile[tile] = dataset_id
+            self._dem_by_tile.move_to_end(tile)
+            if len(self._dem_by_tile) > self.DEM_TILE_CACHE_SIZE:
+                self._dem_by_tile.popitem(last=False)
+    
+    def _load_dem(self, dataset_id: str) -> ee.Image:
+        """
+        Load a DEM dataset as a single image
+        
+        The height band is renamed to 'elevation' whatever the dataset
+        calls it (DSM, ...), so reducer output keys never vary.
+        """
+        if dataset_id in _COLLECTION_DATASETS:
+            tiles = ee.ImageCollection(dataset_id).select([0], ['elevation'])
+            # Keep the native projection so slope/aspect use the right pixel size
+            return tiles.mosaic().setDefaultProjection(tiles.first().projection())
+        return ee.Image(dataset_id).select([0], ['elevation'])
+    
+    def _build_request(
         self,
-        dem: ee.Image,
-        geometry: ee.Geometry
-    ) -> Dict:
-        """Extract elevation statistics"""
+        geometry: ee.Geometry,
+        dem_id: Optional[str] = None,
+        with_histogram: bool = False
+    ) -> ee.Dictionary:
+        """
+        Build the server-side dictionary of all terrain reductions
         
-        stats = dem.reduceRegion(
-            reducer=ee.Reducer.mean()
-                .combine(ee.Reducer.min(), '', True)
-                .combine(ee.Reducer.max(), '', True)
-                .combine(ee.Reducer.stdDev(), '', True),
-            geometry=geometry,
+        DEM selection, elevation, slope (with its histogram) and aspect
+        statistics are packed into one ee.Dictionary so they come back in
+        one getInfo(). A known dem_id skips the DEM selection; the slope
+        histogram is only added when with_histogram is set.
+        """
+        if dem_id:
+            dem = self._load_dem(dem_id)
+        else:
+            dem, dem_id = self._get_best_dem(geometry)
+        elevation_img = dem.select('elevation')
+        # Derive slope/aspect before masking so edge pixels keep their
+        # neighbours outside the polygon
+        slope_img, aspect_img = self._slope_aspect(elevation_img)
+        
+        # Rasterize the polygon once and let the reducers run over its
+        # bounding box, instead of each reducer rasterizing the polygon
+        region_mask = ee.Image.constant(1).clip(geometry)
+        elevation_img = elevation_img.updateMask(region_mask)
+        slope_img = slope_img.updateMask(region_mask)
+        aspect_img = aspect_img.updateMask(region_mask)
+        bounds = geometry.bounds()
+        
+        slope_stats = slope_img.reduceRegion(
+            reducer=_slope_histogram_reducer() if with_histogram else _slope_reducer(),
+            geometry=bounds,
             scale=self.scale,
-            maxPixels=1e8
-        ).getInfo()
+            maxPixels=1e8,
+            tileScale=self.tile_scale
+        )
+        if with_histogram:
+            slope_stats = self._split_histogram(ee.Dictionary(slope_stats))
         
-        # Handle different band names (elevation vs b1)
-        band_name = 'elevation' if 'elevation' in stats else list(stats.keys())[0]
+        return ee.Dictionary({
+            'dem_source': dem_id,
+            'elevation': elevation_img.reduceRegion(
+                reducer=_stats_reducer(),
+                geometry=bounds,
+                scale=self.scale,
+                maxPixels=1e8,
+                tileScale=self.tile_scale
+            ),
+            'slope': slope_stats,
+            'aspect': aspect_img.reduceRegion(
+                reducer=_aspect_reducer(),
+                geometry=bounds,
+                scale=self.scale,
+                maxPixels=1e8,
+                tileScale=self.tile_scale
+            )
+        })
+    
+    @staticmethod
+    def _split_histogram(slope_stats: ee.Dictionary) -> ee.Dictionary:
+        """
+        Replace the fixedHistogram [[bucket_min, count], ...] array with
+        two flat lists, slope_bucket_means and slope_counts
+        
+        The split happens server-side so the client always receives the
+        same shape. Both lists are empty when the region has no data.
+        """
+        histogram = slope_stats.get('slope_histogram')
+        
+        def column(index: int) -> ee.Array:
+            return ee.Array(histogram).slice(1, index, index + 1).project([0])
+        
+        return slope_stats.remove(['slope_histogram']).combine({
+            'slope_bucket_means': ee.Algorithms.If(
+                histogram,
+                column(0).add(_SLOPE_HIST_WIDTH / 2).toList(),
+                ee.List([])
+            ),
+            'slope_counts': ee.Algorithms.If(
+                histogram,
+                column(1).toList(),
+                ee.List([])
+            )
+        })
+    
+    @staticmethod
+    def _slope_aspect(elevation: ee.Image) -> Tuple[ee.Image, ee.Image]:
+        """
+        Derive slope and aspect (degrees) from one gradient pass
+        
+        gradient() yields the east (x) and north (y) derivatives in a single
+        neighbourhood convolution, replacing the separate ee.Terrain.slope
+        and ee.Terrain.aspect passes over the DEM.
+        """
+        gradient = elevation.gradient()
+        gx = gradient.select('x')
+        gy = gradient.select('y')
+        
+        slope = gx.hypot(gy).atan().multiply(180 / math.pi).rename('slope')
+        
+        # Aspect is the compass bearing of the downslope direction (-gx, -gy),
+        # clockwise from north
+        aspect = gx.multiply(-1).atan2(gy.multiply(-1)) \
+            .multiply(180 / math.pi) \
+            .add(360).mod(360) \
+            .rename('aspect')
+        
+        return slope, aspect
+    
+    def _extract_elevation_stats(self, stats: Dict) -> Dict:
+        """Extract elevation statistics"""
         
         return {
-            'mean': float(stats.get(f'{band_name}_mean', 0)),
-            'min': float(stats.get(f'{band_name}_min', 0)),
-            'max': float(stats.get(f'{band_name}_max', 0)),
-            'std': float(stats.get(f'{band_name}_stdDev', 0))
+            'mean': float(stats.get('elevation_mean') or 0),
+            'min': float(stats.get('elevation_min') or 0),
+            'max': float(stats.get('elevation_max') or 0),
+            'std': float(stats.get('elevation_stdDev') or 0)
         }
     
-    def _extract_slope_stats(
-        self,
-        slope_img: ee.Image,
-        geometry: ee.Geometry
-    ) -> Dict:
+    def _extract_slope_stats(self, stats: Dict) -> Dict:
         """Extract slope statistics"""
         
-        # Basic statistics
-        stats = slope_img.reduceRegion(
-            reducer=ee.Reducer.mean()
-                .combine(ee.Reducer.min(), '', True)
-                .combine(ee.Reducer.max(), '', True)
-                .combine(ee.Reducer.stdDev(), '', True),
-            geometry=geometry,
-            scale=self.scale,
-            maxPixels=1e8
-        ).getInfo()
-        
-        # Slope histogram (for distribution analysis)
-        histogram = slope_img.reduceRegion(
-            reducer=ee.Reducer.fixedHistogram(0, 90, 9),  # 0-90° in 10° bins
-            geometry=geometry,
-            scale=self.scale,
-            maxPixels=1e8
-        ).getInfo()
-        
         return {
-            'mean': float(stats.get('slope_mean', 0)),
-            'min': float(stats.get('slope_min', 0)),
-            'max': float(stats.get('slope_max', 0)),
-            'std': float(stats.get('slope_stdDev', 0)),
-            'histogram': histogram.get('slope', [])
+            'mean': float(stats.get('slope_mean') or 0),
+            'min': float(stats.get('slope_p0') or 0),
+            'max': float(stats.get('slope_p100') or 0),
+            'median': float(stats.get('slope_p50') or 0),
+            'p95': float(stats.get('slope_p95') or 0),
+            'std': float(stats.get('slope_stdDev') or 0),
+            'histogram': {
+                'bin_centers': np.asarray(stats.get('slope_bucket_means') or [], dtype=np.float64),
+                'counts': np.asarray(stats.get('slope_counts') or [], dtype=np.float64).astype(np.int64)
+            }
         }
     
-    def _extract_aspect_stats(
-        self,
-        aspect_img: ee.Image,
-        geometry: ee.Geometry
-    ) -> Dict:
+    def _extract_aspect_stats(self, stats: Dict) -> Dict:
         """Extract aspect (orientation) statistics"""
         
-        stats = aspect_img.reduceRegion(
-            reducer=ee.Reducer.mean()
-                .combine(ee.Reducer.mode(), '', True),
-            geometry=geometry,
-            scale=self.scale,
-            maxPixels=1e8
-        ).getInfo()
-        
-        mean_aspect = float(stats.get('aspect_mean', 0))
-        mode_aspect = float(stats.get('aspect_mode', 0))
+        mean_aspect = float(stats.get('aspect_mean') or 0)
+        mode_aspect = float(stats.get('aspect_mode') or 0)
         
         # Convert to cardinal direction
         dominant_direction = self._aspect_to_direction(mode_aspect)
         
         # Classify into 8 directions for distribution
-        distribution = self._calculate_aspect_distribution(aspect_img, geometry)
+        distribution = self._calculate_aspect_distribution()
         
         return {
             'mean': mean_aspect,
@@ -266,17 +690,9 @@ class TerrainExtractor:
     
     def _aspect_to_direction(self, aspect_degrees: float) -> str:
         """Convert aspect degrees to cardinal direction"""
-        directions = [
-            'N', 'NE', 'E', 'SE', 'S', 'SW', 'W', 'NW', 'N'
-        ]
-        index = int((aspect_degrees + 22.5) / 45) % 8
-        return directions[index]
+        return _DIRS[int((aspect_degrees + 22.5) / 45) % 8]
     
-    def _calculate_aspect_distribution(
-        self,
-        aspect_img: ee.Image,
-        geometry: ee.Geometry
-    ) -> Dict:
+    def _calculate_aspect_distribution(self) -> Dict:
         """Calculate distribution across 8 cardinal directions"""
         
         # Create bins for 8 directions (N, NE, E, SE, S, SW, W, NW)
@@ -313,60 +729,52 @@ class TerrainExtractor:
         - Elevation variation (less = better)
         - Terrain complexity
         """
-        score = 10.0  # Start with perfect score
-        
-        avg_slope = slope_stats['mean']
-        max_slope = slope_stats['max']
-        elevation_range = elevation_stats['max'] - elevation_stats['min']
-        
-        # Slope penalties
-        if avg_slope < 3:
-            slope_penalty = 0  # Ideal
-        elif avg_slope < 8:
-            slope_penalty = 1  # Good
-        elif avg_slope < 15:
-            slope_penalty = 2  # Moderate
-        elif avg_slope < 25:
-            slope_penalty = 4  # Challenging
-        else:
-            slope_penalty = 6  # Very difficult
-        
-        # Max slope penalties (steep areas)
-        if max_slope > 35:
-            slope_penalty += 2
-        elif max_slope > 25:
-            slope_penalty += 1
-        
-        # Elevation variation penalties
-        if elevation_range > 200:
-            elevation_penalty = 2
-        elif elevation_range > 100:
-            elevation_penalty = 1
-        else:
-            elevation_penalty = 0
-        
-        score -= slope_penalty
-        score -= elevation_penalty
-        
-        score = max(0, min(10, score))
-        
-        # Classification
-        if score >= 8:
-            buildability_class = 'excellent'
-        elif score >= 6:
-            buildability_class = 'good'
-        elif score >= 4:
-            buildability_class = 'moderate'
-        elif score >= 2:
-            buildability_class = 'challenging'
-        else:
-            buildability_class = 'difficult'
+        batch = self._calculate_buildability_batch({
+            'avg_slope': np.array([slope_stats['mean']], dtype=float),
+            'max_slope': np.array([slope_stats['p95']], dtype=float),
+            'elevation_range': np.array(
+                [elevation_stats['max'] - elevation_stats['min']], dtype=float
+            )
+        })
+        
+        return {
+            'score': float(batch['score'][0]),
+            'class': str(batch['class'][0]),
+            'slope_penalty': int(batch['slope_penalty'][0]),
+            'elevation_penalty': int(batch['elevation_penalty'][0])
+        }
+    
+    def _calculate_buildability_batch(
+        self,
+        stats_soa: Dict[str, np.ndarray]
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate buildability scores for many sites at once
+        
+        Terrain complexity depends on the same inputs, so it is classified
+        in the same kernel pass.
+        
+        Args:
+            stats_soa: Arrays 'avg_slope', 'max_slope' (the steep-area
+                slope, P95 from extraction) and 'elevation_range', one entry
+                per site
+            
+        Returns:
+            Arrays 'score', 'class', 'slope_penalty', 'elevation_penalty',
+            'complexity'
+        """
+        score, class_idx, slope_penalty, elevation_penalty, complexity_idx = terrain_scores(
+            stats_soa['avg_slope'],
+            stats_soa['max_slope'],
+            stats_soa['elevation_range']
+        )
         
         return {
-            'score': round(score, 1),
-            'class': buildability_class,
+            'score': np.round(score, 1),
+            'class': _BUILDABILITY_CLASSES[class_idx],
             'slope_penalty': slope_penalty,
-            'elevation_penalty': elevation_penalty
+            'elevation_penalty': elevation_penalty,
+            'complexity': _COMPLEXITY_CLASSES[complexity_idx]
         }
     
     def _calculate_terrain_complexity(
@@ -380,16 +788,9 @@ class TerrainExtractor:
         Returns:
             'flat', 'gentle', 'rolling', 'hilly', 'mountainous'
         """
-        avg_slope = slope_stats['mean']
-        elevation_range = elevation_stats['max'] - elevation_stats['min']
-        
-        if avg_slope < 2 and elevation_range < 20:
-            return 'flat'
-        elif avg_slope < 5 and elevation_range < 50:
-            return 'gentle'
-        elif avg_slope < 10 and elevation_range < 100:
-            return 'rolling'
-        elif avg_slope < 20 and elevation_range < 300:
-            return 'hilly'
-        else:
-            return 'mountainous'
+        *_, complexity_idx = terrain_scores(
+            np.array([slope_stats['mean']], dtype=float),
+            np.array([slope_stats['max']], dtype=float),
+            np.array([elevation_stats['max'] - elevation_stats['min']], dtype=float)
+        )
+        return str(_COMPLEXITY_CLASSES[complexity_idx[0]])
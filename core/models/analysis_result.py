@@ -3,18 +3,169 @@
 # Immutable Analysis Result - Single Source of Truth
 # ============================================================================
 
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import Dict, List, Optional, Any
 from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter
+from types import MappingProxyType
+import copy
 import json
+import math
+import numbers
+import sys
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
-@dataclass(frozen=True)
+# orjson options for to_json: numpy values and non-string keys are
+# serialized like json.dumps would (anything else unknown goes through str)
+_ORJSON_OPTIONS = (
+    orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    if HAS_ORJSON else 0
+)
+
+
+def _has_non_finite(value) -> bool:
+    """True if a JSON-bound structure holds inf/NaN anywhere"""
+    if isinstance(value, dict):
+        return any(_has_non_finite(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return any(_has_non_finite(v) for v in value)
+    return (
+        isinstance(value, numbers.Real)
+        and not isinstance(value, numbers.Integral)
+        and not math.isfinite(value)
+    )
+
+
+# Summary text sections; the fixed part is filled with a single format()
+_HEADER_SEP = "=" * 50
+_SUMMARY_HEADER = f"LAND ANALYSIS SUMMARY\n{_HEADER_SEP}\n"
+_RISK_SUMMARY_HEADER = "RISK SUMMARY\n"
+_SUMMARY_TEMPLATE = (
+    _SUMMARY_HEADER +
+    "\n"
+    "Analysis ID: {analysis_id}\n"
+    "Date: {timestamp}\n"
+    "\n"
+    "LOCATION\n"
+    "  Area: {area_hectares:.2f} hectares ({area_acres:.2f} acres)\n"
+    "  Coordinates: {lat:.4f}°N, {lon:.4f}°E\n"
+    "  {location_summary}\n"
+    "\n"
+    "OVERALL ASSESSMENT\n"
+    "  Suitability Score: {overall_score:.1f}/10\n"
+    "  Confidence: {confidence:.0f}%\n"
+    "  Overall Risk: {risk_level}\n"
+    "  {development_potential}\n"
+    "\n"
+)
+_RECOMMENDATION_TEMPLATE = (
+    "TOP RECOMMENDATION\n"
+    "  {usage_type}: {suitability_score:.1f}/10\n"
+    "\n"
+)
+_DATA_QUALITY_TEMPLATE = (
+    "DATA QUALITY\n"
+    "  Terrain: {terrain}\n"
+    "  Infrastructure: {infrastructure}\n"
+    "  Earth Engine: {earth_engine}"
+)
+
+
+# Per-risk fields copied into the legacy comprehensive_risks format
+_RISK_FIELDS = ('level', 'severity', 'score', 'primary_factors', 'description', 'impact')
+_RISK_GETTER = attrgetter(*_RISK_FIELDS)
+_RISK_TYPES = ('flood', 'landslide', 'erosion', 'seismic', 'drought', 'wildfire', 'subsidence')
+_RISK_TYPES_GETTER = attrgetter(*_RISK_TYPES)
+
+
+# RiskLevel members are a small fixed set, so their string forms are
+# computed once per member
+@lru_cache(maxsize=None)
+def _risk_level_key(level) -> str:
+    """Legacy risk level key, e.g. 'very_high'"""
+    return sys.intern(level.name.lower())
+
+
+@lru_cache(maxsize=None)
+def _risk_level_display(level) -> str:
+    """Display risk level name, e.g. 'very high'"""
+    return sys.intern(level.name.lower().replace('_', ' '))
+
+
+def _risk_dict(risk) -> Dict:
+    """Convert one risk assessment to its legacy dict"""
+    level, severity, score, primary_factors, description, impact = _RISK_GETTER(risk)
+    return {
+        'level': _risk_level_key(level),
+        'severity': severity,
+        'score': score,
+        'primary_factors': primary_factors,
+        'description': description,
+        'impact': impact
+    }
+
+
+def _intern(value):
+    """Intern status strings so comparisons are mostly pointer checks"""
+    return sys.intern(value) if type(value) is str else value
+
+
+class _memoized:
+    """
+    Compute-once property for frozen, slotted dataclasses
+    
+    The value lives in the private slot '_<name>' (declared as an
+    init=False field without a default); the first read fills it through
+    object.__setattr__, later reads are a plain slot load.
+    """
+    
+    def __init__(self, func):
+        self.func = func
+        self.slot = f'_{func.__name__}'
+        self.__doc__ = func.__doc__
+    
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        try:
+            return getattr(instance, self.slot)
+        except AttributeError:
+            value = self.func(instance)
+            object.__setattr__(instance, self.slot, value)
+            return value
+
+
+def _getstate(self) -> Dict:
+    """
+    Pickle/copy state: the init fields only
+    
+    The init=False slots are caches or snapshots that may still be unset
+    (and a MappingProxyType cannot be pickled), so they are rebuilt by
+    __post_init__ in _setstate rather than carried along.
+    """
+    return {f.name: getattr(self, f.name) for f in fields(self) if f.init}
+
+
+def _setstate(self, state: Dict):
+    """Restore the init fields and re-derive snapshots via __post_init__"""
+    for name, value in state.items():
+        object.__setattr__(self, name, value)
+    self.__post_init__()
+
+
+@dataclass(frozen=True, slots=True)
 class AnalysisMetadata:
     """
     Metadata about the analysis execution
     
-    frozen=True makes this immutable
+    frozen=True makes this immutable; slots=True drops the per-instance
+    __dict__
     """
     analysis_id: str
     timestamp: str
@@ -24,9 +175,20 @@ class AnalysisMetadata:
     osm_quality: str  # 'real_osm', 'enhanced', 'mock', 'unknown'
     ml_enabled: bool
     
-    def to_dict(self) -> Dict:
-        """Convert to dictionary"""
-        return {
+    # Read-only dict view (filled on first access by _memoized)
+    _as_mapping: MappingProxyType = field(init=False, compare=False, repr=False)
+    
+    __getstate__ = _getstate
+    __setstate__ = _setstate
+    
+    def __post_init__(self):
+        """Intern the status string (small fixed vocabulary)"""
+        object.__setattr__(self, 'osm_quality', _intern(self.osm_quality))
+    
+    @_memoized
+    def as_mapping(self) -> MappingProxyType:
+        """Read-only dictionary view, built once (no copy for readers)"""
+        return MappingProxyType({
             'analysis_id': self.analysis_id,
             'timestamp': self.timestamp,
             'duration_seconds': self.duration_seconds,
@@ -34,10 +196,14 @@ class AnalysisMetadata:
             'ee_available': self.ee_available,
             'osm_quality': self.osm_quality,
             'ml_enabled': self.ml_enabled
-        }
+        })
+    
+    def to_dict(self) -> Dict:
+        """Convert to dictionary"""
+        return dict(self.as_mapping)
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class AnalysisResult:
     """
     Complete, immutable analysis result
@@ -48,7 +214,9 @@ class AnalysisResult:
     - Contains ALL analysis outputs
     - UI reads this, never computes
     
-    frozen=True ensures immutability at Python level
+    frozen=True ensures immutability at Python level; slots=True replaces
+    the instance __dict__ with fixed slots (the cached fields below are
+    still set through object.__setattr__)
     """
     
     # Metadata
@@ -73,18 +241,61 @@ class AnalysisResult:
     overall_score: float
     confidence_level: float
     
-    # Computed properties (cached)
-    _key_insights: Optional[Dict] = field(default=None, compare=False, repr=False)
-    _summary_text: Optional[str] = field(default=None, compare=False, repr=False)
+    # Computed properties (filled on first access by _memoized)
+    _key_insights: Dict = field(init=False, compare=False, repr=False)
+    _summary_text: str = field(init=False, compare=False, repr=False)
+    _parsed_timestamp: datetime = field(init=False, compare=False, repr=False)
+    
+    # Derived values (snapshotted once in __post_init__)
+    _area_hectares: float = field(init=False, compare=False, repr=False)
+    _area_acres: float = field(init=False, compare=False, repr=False)
+    _centroid: List[float] = field(init=False, compare=False, repr=False)
+    _overall_risk_level: str = field(init=False, compare=False, repr=False)
+    _high_risk_count: int = field(init=False, compare=False, repr=False)
+    _average_severity: float = field(init=False, compare=False, repr=False)
+    _risk_summary: List[str] = field(init=False, compare=False, repr=False)
+    _top_recommendations: tuple = field(init=False, compare=False, repr=False)
+    _top_risk_summary: tuple = field(init=False, compare=False, repr=False)
+    _data_sources: Dict = field(init=False, compare=False, repr=False)
+    
+    __getstate__ = _getstate
+    __setstate__ = _setstate
     
     def __post_init__(self):
-        """Validate result after creation"""
+        """Validate result after creation and snapshot derived values"""
         # Basic validation
         if not 0 <= self.overall_score <= 10:
             raise ValueError(f"Invalid overall_score: {self.overall_score}")
         
         if not 0 <= self.confidence_level <= 1:
             raise ValueError(f"Invalid confidence_level: {self.confidence_level}")
+        
+        # The inputs never change after creation, so derive once
+        # (object.__setattr__ works even with frozen=True)
+        boundary = self.boundary
+        object.__setattr__(self, '_area_hectares', boundary.get('area_hectares', 0))
+        object.__setattr__(self, '_area_acres', boundary.get('area_acres', 0))
+        object.__setattr__(self, '_centroid', boundary.get('centroid', [0, 0]))
+        object.__setattr__(self, '_top_recommendations', tuple(self.recommendations[:5]))
+        
+        metadata = self.metadata
+        object.__setattr__(self, '_data_sources', {
+            'terrain': _intern(self.terrain.get('data_quality', 'unknown')),
+            'environmental': _intern(self.environmental.get('data_quality', 'unknown')),
+            'infrastructure': _intern(self.infrastructure.get('data_quality', 'unknown')),
+            'earth_engine': metadata.ee_available,
+            'osm': metadata.osm_quality,
+            'ml': metadata.ml_enabled
+        })
+        
+        # validate() reports a missing risk_assessment
+        risk = self.risk_assessment
+        if risk is not None:
+            object.__setattr__(self, '_overall_risk_level', _risk_level_display(risk.overall_level))
+            object.__setattr__(self, '_high_risk_count', risk.high_risk_count)
+            object.__setattr__(self, '_average_severity', risk.average_severity)
+            object.__setattr__(self, '_risk_summary', risk.summary)
+            object.__setattr__(self, '_top_risk_summary', tuple(risk.summary[:3]))
     
     # ========== PROPERTIES (read-only access to nested data) ==========
     
@@ -98,20 +309,25 @@ class AnalysisResult:
         """Get analysis timestamp"""
         return self.metadata.timestamp
     
+    @_memoized
+    def parsed_timestamp(self) -> datetime:
+        """Get analysis timestamp as a datetime (parsed once)"""
+        return datetime.fromisoformat(self.timestamp)
+    
     @property
     def area_hectares(self) -> float:
         """Get area in hectares"""
-        return self.boundary.get('area_hectares', 0)
+        return self._area_hectares
     
     @property
     def area_acres(self) -> float:
         """Get area in acres"""
-        return self.boundary.get('area_acres', 0)
+        return self._area_acres
     
     @property
     def centroid(self) -> List[float]:
         """Get boundary centroid [lon, lat]"""
-        return self.boundary.get('centroid', [0, 0])
+        return self._centroid
     
     @property
     def terrain(self) -> Dict:
@@ -131,12 +347,12 @@ class AnalysisResult:
     @property
     def overall_risk_level(self) -> str:
         """Get overall risk level name"""
-        return self.risk_assessment.overall_level.name.lower().replace('_', ' ')
+        return self._overall_risk_level
     
     @property
     def risk_summary(self) -> List[str]:
         """Get risk summary lines"""
-        return self.risk_assessment.summary
+        return self._risk_summary
     
     @property
     def top_recommendation(self) -> Optional[Dict]:
@@ -146,36 +362,28 @@ class AnalysisResult:
     @property
     def high_risk_count(self) -> int:
         """Get count of high-severity risks"""
-        return self.risk_assessment.high_risk_count
+        return self._high_risk_count
+    
+    @property
+    def average_severity(self) -> float:
+        """Get average risk severity"""
+        return self._average_severity
     
     @property
     def data_sources(self) -> Dict:
         """Get data quality information"""
-        return {
-            'terrain': self.terrain.get('data_quality', 'unknown'),
-            'environmental': self.environmental.get('data_quality', 'unknown'),
-            'infrastructure': self.infrastructure.get('data_quality', 'unknown'),
-            'earth_engine': self.metadata.ee_available,
-            'osm': self.metadata.osm_quality,
-            'ml': self.metadata.ml_enabled
-        }
+        return self._data_sources
     
     # ========== COMPUTED INSIGHTS (cached) ==========
     
-    @property
+    @_memoized
     def key_insights(self) -> Dict:
         """
         Get computed key insights
         
-        Computed once and cached (using __dict__ hack for frozen dataclass)
+        Computed once and cached in the _key_insights slot
         """
-        if self._key_insights is None:
-            # Compute insights
-            insights = self._compute_insights()
-            # Cache it (this works even with frozen=True)
-            object.__setattr__(self, '_key_insights', insights)
-        
-        return self._key_insights
+        return self._compute_insights()
     
     def _compute_insights(self) -> Dict:
         """Compute key insights from analysis"""
@@ -189,25 +397,31 @@ class AnalysisResult:
             'development_potential': ''
         }
         
+        # Fetch each input once
+        infra = self.infrastructure
+        slope = self.terrain.get('slope_avg', 999)
+        road_dist = infra.get('nearest_road_distance', 999999)
+        high_risk = self.high_risk_count
+        score = self.overall_score
+        
         # Strengths
-        if self.terrain.get('slope_avg', 999) < 5:
+        if slope < 5:
             insights['strengths'].append(
-                f"Gentle terrain: {self.terrain.get('slope_avg', 0):.1f}° slope ideal for construction"
+                f"Gentle terrain: {slope:.1f}° slope ideal for construction"
             )
         
-        road_dist = self.infrastructure.get('nearest_road_distance', 999999)
         if road_dist < 500:
             insights['strengths'].append(
                 f"Excellent access: {road_dist:.0f}m to nearest road"
             )
         
-        if self.high_risk_count == 0:
+        if high_risk == 0:
             insights['strengths'].append("No high-severity environmental risks identified")
         
         # Concerns
-        if self.high_risk_count > 0:
+        if high_risk > 0:
             insights['concerns'].append(
-                f"⚠️ {self.high_risk_count} high-severity risk(s) require mitigation"
+                f"⚠️ {high_risk} high-severity risk(s) require mitigation"
             )
         
         if road_dist > 2000:
@@ -216,32 +430,32 @@ class AnalysisResult:
             )
         
         # Opportunities
-        if self.overall_score > 8:
+        if score > 8:
             insights['opportunities'].append(
                 "Exceptional suitability - strong development potential"
             )
         
-        dev_pressure = self.infrastructure.get('development_pressure', 'low')
+        dev_pressure = infra.get('development_pressure', 'low')
         if dev_pressure == 'high':
             insights['opportunities'].append(
                 "High development pressure indicates strong market demand"
             )
         
         # Summaries
-        city = self.infrastructure.get('city_name', 'Unknown')
-        urban_level = self.infrastructure.get('urbanization_level', 'unknown')
+        city = infra.get('city_name', 'Unknown')
+        urban_level = infra.get('urbanization_level', 'unknown')
         insights['location_summary'] = f"{city}, {urban_level} area"
         
-        access_score = self.infrastructure.get('accessibility_score', 0)
+        access_score = infra.get('accessibility_score', 0)
         insights['accessibility_summary'] = (
             f"Accessibility score: {access_score:.1f}/10"
         )
         
-        if self.overall_score > 8:
+        if score > 8:
             potential = "Exceptional development potential"
-        elif self.overall_score > 6:
+        elif score > 6:
             potential = "Strong development potential with manageable constraints"
-        elif self.overall_score > 4:
+        elif score > 4:
             potential = "Moderate potential - careful planning required"
         else:
             potential = "Limited potential - significant constraints present"
@@ -250,67 +464,60 @@ class AnalysisResult:
         
         return insights
     
-    @property
+    @_memoized
     def summary_text(self) -> str:
         """
         Get human-readable summary text
         
-        Computed once and cached
+        Computed once and cached in the _summary_text slot
         """
-        if self._summary_text is None:
-            summary = self._generate_summary_text()
-            object.__setattr__(self, '_summary_text', summary)
-        
-        return self._summary_text
+        return self._generate_summary_text()
     
     def _generate_summary_text(self) -> str:
         """Generate summary text"""
         
-        lines = [
-            f"LAND ANALYSIS SUMMARY",
-            f"=" * 50,
-            f"",
-            f"Analysis ID: {self.analysis_id}",
-            f"Date: {self.timestamp}",
-            f"",
-            f"LOCATION",
-            f"  Area: {self.area_hectares:.2f} hectares ({self.area_acres:.2f} acres)",
-            f"  Coordinates: {self.centroid[1]:.4f}°N, {self.centroid[0]:.4f}°E",
-            f"  {self.key_insights['location_summary']}",
-            f"",
-            f"OVERALL ASSESSMENT",
-            f"  Suitability Score: {self.overall_score:.1f}/10",
-            f"  Confidence: {self.confidence_level * 100:.0f}%",
-            f"  Overall Risk: {self.overall_risk_level.title()}",
-            f"  {self.key_insights['development_potential']}",
-            f"",
-        ]
+        insights = self.key_insights
+        centroid = self.centroid
+        sources = self.data_sources
+        
+        parts = [_SUMMARY_TEMPLATE.format(
+            analysis_id=self.analysis_id,
+            timestamp=self.timestamp,
+            area_hectares=self.area_hectares,
+            area_acres=self.area_acres,
+            lat=centroid[1],
+            lon=centroid[0],
+            location_summary=insights['location_summary'],
+            overall_score=self.overall_score,
+            confidence=self.confidence_level * 100,
+            risk_level=self.overall_risk_level.title(),
+            development_potential=insights['development_potential']
+        )]
         
         # Top recommendation
-        if self.top_recommendation:
-            rec = self.top_recommendation
-            lines.extend([
-                f"TOP RECOMMENDATION",
-                f"  {rec['usage_type']}: {rec['suitability_score']:.1f}/10",
-                f""
-            ])
-        
-        # Risk summary
-        if self.risk_summary:
-            lines.append("RISK SUMMARY")
-            for line in self.risk_summary[:3]:  # Top 3
-                lines.append(f"  {line}")
-            lines.append("")
+        rec = self.top_recommendation
+        if rec:
+            parts.append(_RECOMMENDATION_TEMPLATE.format(
+                usage_type=rec['usage_type'],
+                suitability_score=rec['suitability_score']
+            ))
+        
+        # Risk summary (top 3)
+        if self._top_risk_summary:
+            parts.append(
+                _RISK_SUMMARY_HEADER
+                + "\n".join(f"  {line}" for line in self._top_risk_summary)
+                + "\n\n"
+            )
         
         # Data quality
-        lines.extend([
-            f"DATA QUALITY",
-            f"  Terrain: {self.data_sources['terrain']}",
-            f"  Infrastructure: {self.data_sources['infrastructure']}",
-            f"  Earth Engine: {'Available' if self.data_sources['earth_engine'] else 'Not Available'}",
-        ])
+        parts.append(_DATA_QUALITY_TEMPLATE.format(
+            terrain=sources['terrain'],
+            infrastructure=sources['infrastructure'],
+            earth_engine='Available' if sources['earth_engine'] else 'Not Available'
+        ))
         
-        return "\n".join(lines)
+        return "".join(parts)
     
     # ========== SERIALIZATION ==========
     
@@ -318,28 +525,31 @@ class AnalysisResult:
         """
         Convert to dictionary (for storage/API)
         
+        Nested dicts and lists are built fresh on every call (from the
+        snapshotted values), so callers may mutate the output freely.
+        
         Args:
             include_full_features: If False, excludes large feature dicts
         """
         result = {
             'metadata': self.metadata.to_dict(),
             'boundary': {
-                'area_hectares': self.area_hectares,
-                'area_acres': self.area_acres,
-                'centroid': self.centroid,
+                'area_hectares': self._area_hectares,
+                'area_acres': self._area_acres,
+                'centroid': copy.copy(self._centroid),
                 'perimeter_m': self.boundary.get('perimeter_m', 0)
             },
             'overall_score': self.overall_score,
             'confidence_level': self.confidence_level,
             'risk': {
-                'overall_level': self.overall_risk_level,
-                'average_severity': self.risk_assessment.average_severity,
-                'high_risk_count': self.high_risk_count,
-                'summary': self.risk_summary
+                'overall_level': self._overall_risk_level,
+                'average_severity': self._average_severity,
+                'high_risk_count': self._high_risk_count,
+                'summary': list(self._risk_summary)
             },
-            'recommendations': self.recommendations[:5],  # Top 5
-            'key_insights': self.key_insights,
-            'data_sources': self.data_sources
+            'recommendations': list(self._top_recommendations),  # Top 5
+            'key_insights': copy.deepcopy(self.key_insights),
+            'data_sources': dict(self._data_sources)
         }
         
         if include_full_features:
@@ -349,8 +559,18 @@ class AnalysisResult:
         return result
     
     def to_json(self, include_full_features: bool = False, indent: int = 2) -> str:
-        """Convert to JSON string"""
+        """
+        Convert to JSON string
+        
+        Uses orjson when installed; it only indents by 2, so other indents
+        fall back to the json module. So does data holding inf/NaN (e.g.
+        sentinel distances): orjson would write null, json writes
+        Infinity/NaN.
+        """
         data = self.to_dict(include_full_features=include_full_features)
+        if HAS_ORJSON and indent in (None, 2) and not _has_non_finite(data):
+            option = _ORJSON_OPTIONS | (orjson.OPT_INDENT_2 if indent else 0)
+            return orjson.dumps(data, default=str, option=option).decode()
         return json.dumps(data, indent=indent, default=str)
     
     def to_legacy_format(self) -> Dict:
@@ -359,58 +579,50 @@ class AnalysisResult:
         
         This allows gradual migration of UI code
         """
+        metadata = self.metadata
+        overall_score = self.overall_score
+        confidence = self.confidence_level
+        
         return {
-            'analysis_id': self.analysis_id,
-            'timestamp': self.timestamp,
+            'analysis_id': metadata.analysis_id,
+            'timestamp': metadata.timestamp,
             'boundary': self.boundary,
             'features': self.features,
-            'overall_score': self.overall_score,
-            'confidence_level': self.confidence_level,
+            'overall_score': overall_score,
+            'confidence_level': confidence,
             'risk_assessment': {
-                'level': self.overall_risk_level,
-                'risk_count': self.high_risk_count,
+                'level': self._overall_risk_level,
+                'risk_count': self._high_risk_count,
                 'comprehensive_data': self._risk_to_legacy_format()
             },
             'recommendations': self.recommendations,
             'key_insights': self.key_insights,
-            'data_sources': self.data_sources,
+            'data_sources': self._data_sources,
             'final_scores': {
-                'overall_score': self.overall_score,
+                'overall_score': overall_score,
                 'ahp_score': self.suitability.get('overall_score', 0),
-                'confidence': self.confidence_level
+                'confidence': confidence
             }
         }
     
     def _risk_to_legacy_format(self) -> Dict:
         """Convert risk result to legacy comprehensive_risks format"""
+        risk = self.risk_assessment
         
-        def risk_to_dict(risk_assessment):
-            return {
-                'level': risk_assessment.level.name.lower(),
-                'severity': risk_assessment.severity,
-                'score': risk_assessment.score,
-                'primary_factors': risk_assessment.primary_factors,
-                'description': risk_assessment.description,
-                'impact': risk_assessment.impact
-            }
-        
-        return {
-            'flood': risk_to_dict(self.risk_assessment.flood),
-            'landslide': risk_to_dict(self.risk_assessment.landslide),
-            'erosion': risk_to_dict(self.risk_assessment.erosion),
-            'seismic': risk_to_dict(self.risk_assessment.seismic),
-            'drought': risk_to_dict(self.risk_assessment.drought),
-            'wildfire': risk_to_dict(self.risk_assessment.wildfire),
-            'subsidence': risk_to_dict(self.risk_assessment.subsidence),
-            'overall': {
-                'level': self.risk_assessment.overall_level.name.lower(),
-                'average_severity': self.risk_assessment.average_severity,
-                'high_risk_count': self.risk_assessment.high_risk_count,
-                'medium_risk_count': self.risk_assessment.medium_risk_count
-            },
-            'summary': self.risk_assessment.summary,
-            'mitigation': self.risk_assessment.mitigation
+        legacy = {
+            risk_type: _risk_dict(assessment)
+            for risk_type, assessment in zip(_RISK_TYPES, _RISK_TYPES_GETTER(risk))
         }
+        legacy['overall'] = {
+            'level': _risk_level_key(risk.overall_level),
+            'average_severity': risk.average_severity,
+            'high_risk_count': risk.high_risk_count,
+            'medium_risk_count': risk.medium_risk_count
+        }
+        legacy['summary'] = risk.summary
+        legacy['mitigation'] = risk.mitigation
+        
+        return legacy
     
     # ========== VALIDATION ==========
     
@@ -444,8 +656,20 @@ class AnalysisResult:
         return errors
     
     def is_valid(self) -> bool:
-        """Check if result is valid"""
-        return len(self.validate()) == 0
+        """
+        Check if result is valid
+        
+        Same checks as validate(), but stops at the first failure and
+        builds no error messages
+        """
+        return (
+            bool(self.metadata.analysis_id)
+            and bool(self.boundary)
+            and bool(self.features)
+            and self.risk_assessment is not None
+            and 0 <= self.overall_score <= 10
+            and 0 <= self.confidence_level <= 1
+        )
     
     # ========== COMPARISON ==========
     
@@ -461,7 +685,6 @@ class AnalysisResult:
             'risk_level_changed': self.overall_risk_level != other.overall_risk_level,
             'high_risk_diff': self.high_risk_count - other.high_risk_count,
             'time_diff_seconds': (
-                datetime.fromisoformat(self.timestamp) - 
-                datetime.fromisoformat(other.timestamp)
+                self.parsed_timestamp - other.parsed_timestamp
             ).total_seconds()
         }
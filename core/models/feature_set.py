@@ -0,0 +1,76 @@
+# ============================================================================
+# FILE: core/models/feature_set.py
+# Typed Feature Records for Batch Pipelines
+# ============================================================================
+
+from dataclasses import dataclass, fields
+from typing import Dict, List
+import numpy as np
+
+
+@dataclass(frozen=True, slots=True)
+class TerrainFeatures:
+    """
+    Terrain features of one site
+    
+    Same fields, in the same order, as the dict TerrainExtractor.extract()
+    returns. slots=True keeps per-site records small in large batches.
+    """
+    # Elevation
+    elevation_avg: float
+    elevation_min: float
+    elevation_max: float
+    elevation_range: float
+    elevation_std: float
+    
+    # Slope
+    slope_avg: float
+    slope_min: float
+    slope_max: float
+    slope_std: float
+    slope_p95: float
+    slope_histogram: Dict
+    
+    # Aspect
+    aspect_avg: float
+    aspect_dominant: str
+    aspect_distribution: Dict
+    
+    # Derived metrics
+    buildability_score: float
+    buildability_class: str
+    terrain_complexity: str
+    
+    # Metadata
+    data_quality: str
+    dem_source: str
+    scale_meters: int
+    
+    def to_dict(self) -> Dict:
+        """Convert to the legacy terrain feature dict"""
+        return {name: getattr(self, name) for name in _TERRAIN_FIELDS}
+
+
+_TERRAIN_FIELDS = tuple(f.name for f in fields(TerrainFeatures))
+
+# Columns to_arrays() emits (the numeric fields)
+TERRAIN_NUMERIC_FIELDS = tuple(
+    f.name for f in fields(TerrainFeatures) if f.type in (float, int)
+)
+
+
+def to_arrays(features: List[TerrainFeatures]) -> Dict[str, np.ndarray]:
+    """
+    Convert per-site records to one float64 array per numeric field
+    
+    The columnar form feeds the vectorized terrain kernels directly.
+    """
+    count = len(features)
+    return {
+        name: np.fromiter(
+            (getattr(f, name) for f in features),
+            dtype=np.float64,
+            count=count
+        )
+        for name in TERRAIN_NUMERIC_FIELDS
+    }
@@ -3,16 +3,22 @@
 # Main Analysis Pipeline Orchestrator
 # ============================================================================
 
-from typing import Dict, Optional, Callable
+from typing import Dict, Optional, Callable, Tuple
+from collections import OrderedDict
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import functools
+import hashlib
+import json
 import logging
-import uuid
+import secrets
+import threading
+import time
+
+import numpy as np
 
 from core.models.analysis_result import AnalysisResult, AnalysisMetadata
-from core.features.terrain import TerrainExtractor
-from core.features.environmental import EnvironmentalExtractor
-from core.features.infrastructure import InfrastructureExtractor
 from core.risk import RiskEngine
 from core.risk.signal_adapter import FeatureToSignalAdapter
 from core.suitability.ahp_engine import AHPEngine
@@ -20,8 +26,36 @@ from core.recommendation.usage_recommender import UsageRecommender
 
 logger = logging.getLogger(__name__)
 
+# Per-hazard attributes of ComprehensiveRiskResult averaged into confidence
+_RISK_NAMES = (
+    'flood', 'landslide', 'erosion', 'seismic',
+    'drought', 'wildfire', 'subsidence'
+)
+
+# Confidence weight per data_quality label; anything else counts as 0.60
+_TERRAIN_CONF = {'gee': 0.95}
+_INFRA_CONF = {'real_osm': 0.90, 'enhanced': 0.75}
+_DEFAULT_CONF = 0.60
+
+
+@functools.lru_cache(maxsize=1)
+def check_ee_available() -> bool:
+    """
+    Check if Earth Engine is available
+    
+    The probe is a live getInfo() round-trip, so the result is cached for
+    the life of the process. Call check_ee_available.cache_clear() to
+    re-probe (e.g. after authenticating in a test).
+    """
+    try:
+        import ee
+        ee.String('test').getInfo()
+        return True
+    except:
+        return False
 
-@dataclass
+
+@dataclass(slots=True)
 class PipelineConfig:
     """Configuration for analysis pipeline"""
     use_real_osm: bool = True
@@ -29,6 +63,7 @@ class PipelineConfig:
     max_area_km2: float = 100.0
     include_recommendations: bool = True
     recommendation_count: int = 10
+    terrain_cache_dir: Optional[str] = None  # None disables the terrain cache
 
 
 class AnalysisPipeline:
@@ -49,6 +84,19 @@ class AnalysisPipeline:
     - Use fallbacks silently
     """
     
+    __slots__ = (
+        'config',
+        '_terrain_extractor', '_env_extractor', '_infra_extractor',
+        'risk_engine', 'signal_adapter', '_signal_cache', '_signal_lock',
+        'ahp_engine', 'recommender'
+    )
+    
+    # Converted risk signals kept per pipeline, keyed by feature fingerprint
+    SIGNAL_CACHE_SIZE = 128
+    
+    # Smallest progress step (in percent) forwarded to the callback
+    PROGRESS_MIN_STEP = 5
+    
     def __init__(self, config: Optional[PipelineConfig] = None):
         """
         Initialize pipeline with all required components
@@ -65,30 +113,56 @@ class AnalysisPipeline:
         self._init_engines()
         
         logger.info(
-            f"Analysis pipeline initialized with config: "
-            f"OSM={self.config.use_real_osm}, "
-            f"ML={self.config.enable_ml_predictions}"
+            "Analysis pipeline initialized with config: OSM=%s, ML=%s",
+            self.config.use_real_osm,
+            self.config.enable_ml_predictions
         )
     
     def _init_extractors(self):
-        """Initialize all feature extractors"""
-        
-        # Check EE availability
-        self.ee_available = self._check_ee_available()
+        """
+        Initialize all feature extractors
         
-        if self.ee_available:
+        Extractors (and the Earth Engine client they import) are created on
+        first use by the properties below, so constructing a pipeline costs
+        no imports or network probes until an analysis actually runs.
+        """
+        self._terrain_extractor = None
+        self._env_extractor = None
+        self._infra_extractor = None
+    
+    @property
+    def ee_available(self) -> bool:
+        """Whether Earth Engine is usable (probed once per process)"""
+        return check_ee_available()
+    
+    @property
+    def terrain_extractor(self):
+        """TerrainExtractor, or None without Earth Engine"""
+        if self._terrain_extractor is None and self.ee_available:
+            from core.features.terrain import TerrainExtractor
             logger.info("Earth Engine available - will use real GEE data")
-            self.terrain_extractor = TerrainExtractor()
-            self.env_extractor = EnvironmentalExtractor()
-        else:
-            logger.warning("Earth Engine NOT available - limited functionality")
-            self.terrain_extractor = None
-            self.env_extractor = None
-        
-        # Infrastructure always available
-        self.infra_extractor = InfrastructureExtractor(
-            use_real_osm=self.config.use_real_osm
-        )
+            self._terrain_extractor = TerrainExtractor(
+                cache_dir=self.config.terrain_cache_dir
+            )
+        return self._terrain_extractor
+    
+    @property
+    def env_extractor(self):
+        """EnvironmentalExtractor, or None without Earth Engine"""
+        if self._env_extractor is None and self.ee_available:
+            from core.features.environmental import EnvironmentalExtractor
+            self._env_extractor = EnvironmentalExtractor()
+        return self._env_extractor
+    
+    @property
+    def infra_extractor(self):
+        """InfrastructureExtractor (always available)"""
+        if self._infra_extractor is None:
+            from core.features.infrastructure import InfrastructureExtractor
+            self._infra_extractor = InfrastructureExtractor(
+                use_real_osm=self.config.use_real_osm
+            )
+        return self._infra_extractor
     
     def _init_engines(self):
         """Initialize analysis engines"""
@@ -105,6 +179,8 @@ class AnalysisPipeline:
         
         self.risk_engine = RiskEngine(ml_adapter=ml_adapter)
         self.signal_adapter = FeatureToSignalAdapter()
+        self._signal_cache: 'OrderedDict[bytes, Tuple[Dict, Optional[Dict]]]' = OrderedDict()
+        self._signal_lock = threading.Lock()  # pipeline may serve several sessions
         
         # Suitability engine
         self.ahp_engine = AHPEngine()
@@ -112,15 +188,6 @@ class AnalysisPipeline:
         # Recommendation engine
         self.recommender = UsageRecommender()
     
-    def _check_ee_available(self) -> bool:
-        """Check if Earth Engine is available"""
-        try:
-            import ee
-            ee.String('test').getInfo()
-            return True
-        except:
-            return False
-    
     def run_analysis(
         self,
         boundary_data: Dict,
@@ -143,8 +210,13 @@ class AnalysisPipeline:
         # Generate unique analysis ID
         analysis_id = self._generate_analysis_id()
         
-        logger.info(f"Starting analysis {analysis_id}")
-        start_time = datetime.now()
+        logger.info("Starting analysis %s", analysis_id)
+        start_iso = datetime.now().isoformat()
+        start_perf = time.perf_counter()
+        
+        # Throttle state is per run: one pipeline may serve several
+        # sessions concurrently
+        progress_callback = self._throttle_progress(progress_callback)
         
         try:
             # Stage 1: Validate boundary
@@ -176,6 +248,7 @@ class AnalysisPipeline:
             
             # Stage 6: Compile final result
             self._update_progress(progress_callback, "Finalizing results...", 95)
+            duration = time.perf_counter() - start_perf
             result = self._compile_result(
                 analysis_id=analysis_id,
                 boundary_data=boundary_data,
@@ -183,15 +256,17 @@ class AnalysisPipeline:
                 risk_result=risk_result,
                 suitability_result=suitability_result,
                 recommendations=recommendations,
-                start_time=start_time
+                start_iso=start_iso,
+                duration=duration
             )
             
             self._update_progress(progress_callback, "Analysis complete!", 100)
             
-            duration = (datetime.now() - start_time).total_seconds()
             logger.info(
-                f"Analysis {analysis_id} completed in {duration:.2f}s, "
-                f"score={result.overall_score:.1f}/10"
+                "Analysis %s completed in %.2fs, score=%.1f/10",
+                analysis_id,
+                duration,
+                result.overall_score
             )
             
             return result
@@ -221,7 +296,7 @@ class AnalysisPipeline:
         if area_m2 < 100:
             raise ValueError(f"Area too small: {area_m2:.0f} m² (min: 100 m²)")
         
-        logger.info(f"Boundary validated: {area_km2:.2f} km²")
+        logger.info("Boundary validated: %.2f km²", area_km2)
     
     def _extract_features(
         self,
@@ -240,60 +315,163 @@ class AnalysisPipeline:
         shapely_geometry = boundary_data.get('geometry')
         centroid = boundary_data.get('centroid')
         
-        # Extract terrain (requires EE)
-        self._update_progress(progress_callback, "Extracting terrain features...", 15)
+        # Terrain requires EE - fail before any network work is started
+        if not (self.ee_available and ee_geometry and self.terrain_extractor):
+            logger.error("Earth Engine not available - cannot extract terrain")
+            raise RuntimeError(
+                "Earth Engine required for terrain analysis. "
+                "Please configure GEE credentials."
+            )
         
-        if self.ee_available and ee_geometry and self.terrain_extractor:
+        # Earth Engine (terrain + environmental) and OSM are independent
+        # network round-trips; run them concurrently so the stage costs the
+        # slower one instead of their sum. No context manager: its exit
+        # would wait for OSM even when terrain has already failed.
+        executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='pipeline')
+        try:
+            self._update_progress(progress_callback, "Extracting terrain features...", 15)
+            ee_future = executor.submit(
+                self._extract_ee_features,
+                ee_geometry,
+                centroid,
+                shapely_geometry
+            )
+            infra_future = executor.submit(
+                self.infra_extractor.extract,
+                ee_geometry=ee_geometry,
+                centroid=centroid,
+                geometry=shapely_geometry
+            )
+            
+            # Extract terrain (requires EE)
             try:
-                features['terrain'] = self.terrain_extractor.extract(ee_geometry)
+                features['terrain'], environmental = ee_future.result()
                 logger.info("Terrain features extracted from Earth Engine")
             except Exception as e:
                 logger.error(f"Terrain extraction failed: {e}")
                 raise RuntimeError(f"Cannot proceed without terrain data: {e}")
-        else:
-            logger.error("Earth Engine not available - cannot extract terrain")
-            raise RuntimeError(
-                "Earth Engine required for terrain analysis. "
-                "Please configure GEE credentials."
-            )
+            
+            # Extract environmental (requires EE)
+            self._update_progress(progress_callback, "Extracting environmental features...", 30)
+            
+            if environmental is not None:
+                features['environmental'] = environmental
+                logger.info("Environmental features extracted")
+            else:
+                # Environmental is less critical - can continue
+                features['environmental'] = self._get_minimal_environmental()
+            
+            # Extract infrastructure (always available)
+            self._update_progress(progress_callback, "Extracting infrastructure features...", 40)
+            
+            try:
+                features['infrastructure'] = infra_future.result()
+                logger.info(
+                    "Infrastructure features extracted (quality: %s)",
+                    features['infrastructure'].get('data_quality')
+                )
+            except Exception as e:
+                logger.error(f"Infrastructure extraction failed: {e}")
+                raise RuntimeError(f"Infrastructure extraction failed: {e}")
+        finally:
+            # Both futures are done on success; on failure don't block on
+            # the other request (a running one finishes in the background)
+            executor.shutdown(wait=False, cancel_futures=True)
+        
+        features['boundary'] = boundary_data
+        
+        return features
+    
+    def _extract_ee_features(
+        self,
+        ee_geometry,
+        centroid,
+        geometry
+    ) -> Tuple[Dict, Optional[Dict]]:
+        """
+        Extract terrain and environmental features from Earth Engine
         
-        # Extract environmental (requires EE)
-        self._update_progress(progress_callback, "Extracting environmental features...", 30)
+        Tries the fused single-request path first and falls back to one
+        request per extractor if it fails.
         
-        if self.ee_available and ee_geometry and self.env_extractor:
+        Returns:
+            (terrain, environmental); environmental is None if it failed
+            
+        Raises:
+            RuntimeError: If terrain extraction fails
+        """
+        try:
+            return self._extract_terrain_and_env_fused(ee_geometry, centroid, geometry)
+        except Exception as e:
+            logger.warning("Fused Earth Engine request failed, extracting separately: %s", e)
+        
+        terrain = self.terrain_extractor.extract(
+            ee_geometry,
+            centroid=centroid,
+            geometry=geometry
+        )
+        
+        environmental = None
+        if self.env_extractor:
             try:
-                features['environmental'] = self.env_extractor.extract(
+                environmental = self.env_extractor.extract(
                     ee_geometry,
-                    terrain_features=features['terrain']
+                    terrain_features=terrain
                 )
-                logger.info("Environmental features extracted")
             except Exception as e:
-                logger.warning(f"Environmental extraction failed: {e}")
-                # Environmental is less critical - can continue
-                features['environmental'] = self._get_minimal_environmental()
-        else:
-            features['environmental'] = self._get_minimal_environmental()
+                logger.warning("Environmental extraction failed: %s", e)
         
-        # Extract infrastructure (always available)
-        self._update_progress(progress_callback, "Extracting infrastructure features...", 40)
+        return terrain, environmental
+    
+    def _extract_terrain_and_env_fused(
+        self,
+        ee_geometry,
+        centroid,
+        geometry
+    ) -> Tuple[Dict, Optional[Dict]]:
+        """
+        Fetch terrain and environmental stats in one getInfo() call
         
-        try:
-            features['infrastructure'] = self.infra_extractor.extract(
-                ee_geometry=ee_geometry,
-                centroid=centroid,
-                geometry=shapely_geometry
-            )
-            logger.info(
-                f"Infrastructure features extracted "
-                f"(quality: {features['infrastructure'].get('data_quality')})"
+        Both extractors' server-side expressions are packed into a single
+        ee.Dictionary, halving Earth Engine latency on the critical path.
+        Parts already in an extractor's cache are left out of the request.
+        
+        Returns:
+            (terrain, environmental); environmental is None if it failed
+        """
+        import ee
+        
+        terrain = self.terrain_extractor.cached(geometry)
+        env_stats = self.env_extractor.cached_stats(ee_geometry) if self.env_extractor else None
+        
+        request = {}
+        if terrain is None:
+            request['terrain'] = self.terrain_extractor.build_expression(ee_geometry, centroid)
+        if self.env_extractor and env_stats is None:
+            request['env'] = self.env_extractor.build_expression(ee_geometry)
+        
+        fetched = {}
+        if request:
+            fetched = ee.Dictionary(request).getInfo() or {}
+        
+        if terrain is None:
+            terrain = self.terrain_extractor.from_stats(
+                fetched.get('terrain'),
+                centroid,
+                geometry=geometry
             )
-        except Exception as e:
-            logger.error(f"Infrastructure extraction failed: {e}")
-            raise RuntimeError(f"Infrastructure extraction failed: {e}")
         
-        features['boundary'] = boundary_data
+        environmental = None
+        if self.env_extractor:
+            try:
+                environmental = self.env_extractor.from_stats(
+                    ee_geometry,
+                    env_stats if env_stats is not None else fetched.get('env')
+                )
+            except Exception as e:
+                logger.warning("Environmental extraction failed: %s", e)
         
-        return features
+        return terrain, environmental
     
     def _assess_risks(self, features: Dict):
         """
@@ -307,10 +485,9 @@ class AnalysisPipeline:
         """
         try:
             # Convert features to signals
-            signals = self.signal_adapter.convert_all_features(features)
-            location = self.signal_adapter.extract_location(features)
+            signals, location = self._convert_signals(features)
             
-            logger.info(f"Converted {len(signals)} signals for risk assessment")
+            logger.info("Converted %d signals for risk assessment", len(signals))
             
             # Run risk assessment
             risk_result = self.risk_engine.assess_all_risks(
@@ -318,10 +495,12 @@ class AnalysisPipeline:
                 location=location
             )
             
-            logger.info(
-                f"Risk assessment complete: {risk_result.overall_level.name}, "
-                f"avg severity {risk_result.average_severity:.1f}/5"
-            )
+            if logger.isEnabledFor(logging.INFO):
+                logger.info(
+                    "Risk assessment complete: %s, avg severity %.1f/5",
+                    risk_result.overall_level.name,
+                    risk_result.average_severity
+                )
             
             return risk_result
             
@@ -332,6 +511,45 @@ class AnalysisPipeline:
             logger.error(f"Risk assessment failed: {e}", exc_info=True)
             raise RuntimeError(f"Risk assessment failed: {e}")
     
+    def _convert_signals(self, features: Dict) -> Tuple[Dict, Optional[Dict]]:
+        """
+        Convert features to risk signals and location, memoized
+        
+        Signals depend only on the terrain and environmental features and
+        the location only on the boundary centroid, so those are hashed into
+        the cache key; repeated analyses of the same parcel skip the adapter.
+        """
+        fingerprint = json.dumps(
+            [
+                features.get('terrain'),
+                features.get('environmental'),
+                features.get('boundary', {}).get('centroid')
+            ],
+            sort_keys=True,
+            default=str
+        )
+        key = hashlib.blake2b(fingerprint.encode('utf-8'), digest_size=16).digest()
+        
+        with self._signal_lock:
+            cached = self._signal_cache.get(key)
+            if cached is not None:
+                self._signal_cache.move_to_end(key)
+        
+        if cached is not None:
+            signals, location = cached
+            logger.debug("Risk signals served from cache")
+            return dict(signals), location
+        
+        signals = self.signal_adapter.convert_all_features(features)
+        location = self.signal_adapter.extract_location(features)
+        
+        with self._signal_lock:
+            self._signal_cache[key] = (signals, location)
+            if len(self._signal_cache) > self.SIGNAL_CACHE_SIZE:
+                self._signal_cache.popitem(last=False)
+        
+        return dict(signals), location
+    
     def _calculate_suitability(self, features: Dict, risk_result) -> Dict:
         """
         Calculate suitability using AHP
@@ -353,7 +571,8 @@ class AnalysisPipeline:
             )
             
             logger.info(
-                f"Suitability calculated: overall {suitability['overall_score']:.1f}/10"
+                "Suitability calculated: overall %.1f/10",
+                suitability['overall_score']
             )
             
             return suitability
@@ -382,7 +601,7 @@ class AnalysisPipeline:
                 top_n=self.config.recommendation_count
             )
             
-            logger.info(f"Generated {len(recommendations)} recommendations")
+            logger.info("Generated %d recommendations", len(recommendations))
             
             return recommendations
             
@@ -399,7 +618,8 @@ class AnalysisPipeline:
         risk_result,
         suitability_result: Dict,
         recommendations: list,
-        start_time: datetime
+        start_iso: str,
+        duration: float
     ) -> AnalysisResult:
         """
         Compile all results into immutable AnalysisResult
@@ -413,8 +633,8 @@ class AnalysisPipeline:
         # Create metadata
         metadata = AnalysisMetadata(
             analysis_id=analysis_id,
-            timestamp=start_time.isoformat(),
-            duration_seconds=(datetime.now() - start_time).total_seconds(),
+            timestamp=start_iso,
+            duration_seconds=duration,
             pipeline_version="2.0",
             ee_available=self.ee_available,
             osm_quality=features['infrastructure'].get('data_quality', 'unknown'),
@@ -442,38 +662,25 @@ class AnalysisPipeline:
         
         # Data quality
         terrain_quality = features.get('terrain', {}).get('data_quality', 'unknown')
-        if terrain_quality == 'gee':
-            confidence_factors.append(0.95)
-        else:
-            confidence_factors.append(0.60)
+        confidence_factors.append(_TERRAIN_CONF.get(terrain_quality, _DEFAULT_CONF))
         
         # Infrastructure quality
         infra_quality = features['infrastructure'].get('data_quality', 'unknown')
-        if infra_quality == 'real_osm':
-            confidence_factors.append(0.90)
-        elif infra_quality == 'enhanced':
-            confidence_factors.append(0.75)
-        else:
-            confidence_factors.append(0.60)
+        confidence_factors.append(_INFRA_CONF.get(infra_quality, _DEFAULT_CONF))
         
         # Risk assessment confidence
         # Average confidence from all risk assessments
-        risk_confidences = [
-            risk_result.flood.confidence,
-            risk_result.landslide.confidence,
-            risk_result.erosion.confidence,
-            risk_result.seismic.confidence,
-            risk_result.drought.confidence,
-            risk_result.wildfire.confidence,
-            risk_result.subsidence.confidence
-        ]
-        avg_risk_confidence = sum(risk_confidences) / len(risk_confidences)
-        confidence_factors.append(avg_risk_confidence)
+        risk_confidences = np.fromiter(
+            (getattr(risk_result, name).confidence for name in _RISK_NAMES),
+            dtype=np.float64,
+            count=len(_RISK_NAMES)
+        )
+        confidence_factors.append(risk_confidences.mean())
         
         # Overall confidence is average of all factors
-        overall = sum(confidence_factors) / len(confidence_factors)
+        overall = np.mean(confidence_factors)
         
-        return round(overall, 2)
+        return round(float(overall), 2)
     
     def _get_minimal_environmental(self) -> Dict:
         """Minimal environmental data when extraction fails"""
@@ -492,9 +699,7 @@ class AnalysisPipeline:
     
     def _generate_analysis_id(self) -> str:
         """Generate unique analysis ID"""
-        timestamp = datetime.now().strftime('%Y%m%d%H%M%S')
-        unique = str(uuid.uuid4())[:8]
-        return f"LAND_{timestamp}_{unique}"
+        return f"LAND_{time.strftime('%Y%m%d%H%M%S')}_{secrets.token_hex(4)}"
     
     def _update_progress(
         self,
@@ -507,9 +712,35 @@ class AnalysisPipeline:
             try:
                 callback(message, percent)
             except Exception as e:
-                logger.warning(f"Progress callback failed: {e}")
+                logger.warning("Progress callback failed: %s", e)
         
-        logger.debug(f"Progress: {percent}% - {message}")
+        logger.debug("Progress: %d%% - %s", percent, message)
+    
+    def _throttle_progress(
+        self,
+        callback: Optional[Callable[[str, int], None]]
+    ) -> Optional[Callable[[str, int], None]]:
+        """
+        Wrap a progress callback for one run
+        
+        Steps smaller than PROGRESS_MIN_STEP since the last reported value
+        are dropped (completion is always reported), so UI callbacks only
+        fire on meaningful changes. The last value lives in the closure,
+        never on the shared pipeline.
+        """
+        if callback is None:
+            return None
+        
+        last_percent = -self.PROGRESS_MIN_STEP
+        
+        def throttled(message: str, percent: int):
+            nonlocal last_percent
+            if percent - last_percent < self.PROGRESS_MIN_STEP and percent < 100:
+                return
+            last_percent = percent
+            callback(message, percent)
+        
+        return throttled
 
 
 # ============================================================================
@@ -526,6 +757,8 @@ class PipelineContext:
             result2 = pipeline.run_analysis(boundary2)
     """
     
+    __slots__ = ('config', 'pipeline')
+    
     def __init__(self, config: Optional[PipelineConfig] = None):
         self.config = config
         self.pipeline = None
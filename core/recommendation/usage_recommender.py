@@ -4,6 +4,7 @@
 # ============================================================================
 
 from typing import Dict, List
+import heapq
 import logging
 
 logger = logging.getLogger(__name__)
@@ -94,11 +95,13 @@ class UsageRecommender:
             )
             evaluations.append(evaluation)
         
-        # Sort by suitability score (descending)
-        evaluations.sort(key=lambda x: x['suitability_score'], reverse=True)
-        
-        # Take top N
-        top_recommendations = evaluations[:top_n]
+        # Take top N by suitability score (descending); same order as a
+        # full stable sort, without sorting the tail that is dropped
+        top_recommendations = heapq.nlargest(
+            top_n,
+            evaluations,
+            key=lambda x: x['suitability_score']
+        )
         
         # Add ranking
         for i, rec in enumerate(top_recommendations, 1):
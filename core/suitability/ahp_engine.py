@@ -3,8 +3,10 @@
 # AHP (Analytic Hierarchy Process) Engine
 # ============================================================================
 
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
 import logging
+import threading
 import numpy as np
 from config.criteria_config import CriteriaConfig
 
@@ -27,12 +29,18 @@ class AHPEngine:
     - Make land-use recommendations (that's recommender's job)
     """
     
+    # Criteria-derived values kept per engine, keyed by criteria fingerprint
+    CRITERIA_CACHE_SIZE = 64
+    
     def __init__(self):
         """Initialize AHP engine"""
         self.config = CriteriaConfig()
         
         # Consistency threshold for AHP
         self.consistency_threshold = 0.1  # CR < 0.1 is acceptable
+        
+        self._criteria_cache: 'OrderedDict[Tuple, Tuple[Dict, float]]' = OrderedDict()
+        self._criteria_lock = threading.Lock()  # engine may serve several sessions
     
     def auto_select_criteria(
         self,
@@ -88,7 +96,7 @@ class AHPEngine:
         logger.info("Calculating AHP suitability scores")
         
         # Flatten criteria for easier processing
-        flat_criteria = self._flatten_criteria(criteria)
+        flat_criteria, consistency_ratio = self._criteria_profile(criteria)
         
         logger.debug(f"Evaluating {len(flat_criteria)} criteria")
         
@@ -110,9 +118,6 @@ class AHPEngine:
             criteria
         )
         
-        # Calculate consistency ratio (simplified)
-        consistency_ratio = self._calculate_consistency_ratio(criteria)
-        
         result = {
             'criterion_scores': criterion_scores,
             'weighted_scores': weighted_scores,
@@ -130,6 +135,38 @@ class AHPEngine:
         
         return result
     
+    def _criteria_profile(self, criteria: Dict) -> Tuple[Dict, float]:
+        """
+        Flattened weights and consistency ratio for a criteria set, memoized
+        
+        Both depend only on the weights, and auto-selection yields the same
+        few criteria sets over and over in batch runs, so they are computed
+        once per distinct set.
+        """
+        key = tuple(
+            (category, tuple(weights.items()))
+            for category, weights in criteria.items()
+            if isinstance(weights, dict)
+        )
+        
+        with self._criteria_lock:
+            profile = self._criteria_cache.get(key)
+            if profile is not None:
+                self._criteria_cache.move_to_end(key)
+                return profile
+        
+        profile = (
+            self._flatten_criteria(criteria),
+            self._calculate_consistency_ratio(criteria)
+        )
+        
+        with self._criteria_lock:
+            self._criteria_cache[key] = profile
+            if len(self._criteria_cache) > self.CRITERIA_CACHE_SIZE:
+                self._criteria_cache.popitem(last=False)
+        
+        return profile
+    
     def _score_all_criteria(
         self,
         features: Dict,
@@ -466,21 +503,20 @@ class AHPEngine:
             Consistency ratio (lower = more consistent)
         """
         # Simplified: check if weights are relatively balanced
-        flat = self._flatten_criteria(criteria)
-        weights = list(flat.values())
+        weights = np.fromiter(
+            (w for ws in criteria.values() if isinstance(ws, dict) for w in ws.values()),
+            dtype=np.float64
+        )
         
-        if not weights:
+        if weights.size == 0:
             return 0.0
         
-        # Calculate coefficient of variation
-        mean_weight = sum(weights) / len(weights)
-        variance = sum((w - mean_weight) ** 2 for w in weights) / len(weights)
-        std_dev = variance ** 0.5
-        
-        cv = std_dev / mean_weight if mean_weight > 0 else 0
+        # Calculate coefficient of variation in one vectorized pass
+        mean_weight = weights.mean()
+        cv = weights.std() / mean_weight if mean_weight > 0 else 0
         
         # Convert to CR-like metric (0-1 scale)
-        cr = min(1.0, cv)
+        cr = min(1.0, float(cv))
         
         return round(cr, 3)
     